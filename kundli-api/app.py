@@ -1,468 +1,510 @@
-from skyfield.api import load, Topos
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+import os
 import pytz
-from math import degrees
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import swisseph as swe
+import numpy as np
+
+from cache import LRUCache, SingleFlight, SQLiteCache, TieredCache, chart_cache_key
+from chart import CHART_PLANETS, Chart, build_chart
+from chart_context import ChartContext, prefetch_bodies
+from combustion import COMBUSTION_BODIES, find_combustions
+from dasha import dasha_response, parse_dasha
+from ephemeris import get_backend, parse_ephemeris
+from events import DIVISIONS, YearTables, ingress_table
+from executor import ChartExecutor
+from matching import match
+from panchang import daily_panchang, panchang, panchang_year
+from stations import STATION_BODIES, retrograde_periods, station_table
+import resources
+from riseset import describe_rise_set, ist_dates, quantize_location, rise_set
+from transits import compute_transits, parse_ist, parse_step, transit_julian_days
+from vargas import DEFAULT_VARGAS, SHODASHAVARGA
+from zodiac import BODIES
 
 app = Flask(__name__)
 CORS(app)
 
-# Load planetary data
-eph = load('de421.bsp')
-planets = {
-    'Sun': eph['sun'],
-    'Moon': eph['moon'],
-    'Mercury': eph['mercury'],
-    'Venus': eph['venus'],
-    'Mars': eph['mars'],
-    'Jupiter': eph['jupiter barycenter'],
-    'Saturn': eph['saturn barycenter']
-}
-
-# Mapping of Sanskrit Rashis to English names
-RASHI_TRANSLATION = {
-    'Mesha': 'Aries',
-    'Vrishabha': 'Taurus',
-    'Mithuna': 'Gemini',
-    'Karka': 'Cancer',
-    'Simha': 'Leo',
-    'Kanya': 'Virgo',
-    'Tula': 'Libra',
-    'Vrishchika': 'Scorpio',
-    'Dhanu': 'Sagittarius',
-    'Makara': 'Capricorn',
-    'Kumbha': 'Aquarius',
-    'Meena': 'Pisces'
-}
-
-# Mapping of Rashis to their numbers
-ZODIAC_TO_NUMBER = {
-    'Aries': 1,
-    'Taurus': 2,
-    'Gemini': 3,
-    'Cancer': 4,
-    'Leo': 5,
-    'Virgo': 6,
-    'Libra': 7,
-    'Scorpio': 8,
-    'Sagittarius': 9,
-    'Capricorn': 10,
-    'Aquarius': 11,
-    'Pisces': 12
-}
-
-# Mapping of Rashis and their lords (using English names)
-rashis = {
-    'Aries': {'lord': 'Mars'},
-    'Taurus': {'lord': 'Venus'},
-    'Gemini': {'lord': 'Mercury'},
-    'Cancer': {'lord': 'Moon'},
-    'Leo': {'lord': 'Sun'},
-    'Virgo': {'lord': 'Mercury'},
-    'Libra': {'lord': 'Venus'},
-    'Scorpio': {'lord': 'Mars'},
-    'Sagittarius': {'lord': 'Jupiter'},
-    'Capricorn': {'lord': 'Saturn'},
-    'Aquarius': {'lord': 'Saturn'},
-    'Pisces': {'lord': 'Jupiter'}
-}
-
-# Nakshatras and their Lords
-nakshatras = [
-    ('Ashwini', 'Ketu', 0), ('Bharani', 'Venus', 13.20), ('Krittika', 'Sun', 26.40), 
-    ('Rohini', 'Moon', 40), ('Mrigashira', 'Mars', 53.20), ('Ardra', 'Rahu', 66.40), 
-    ('Punarvasu', 'Jupiter', 80), ('Pushya', 'Saturn', 93.20), ('Ashlesha', 'Mercury', 106.40),
-    ('Magha', 'Ketu', 120), ('Purva Phalguni', 'Venus', 133.20), ('Uttara Phalguni', 'Sun', 146.40),
-    ('Hasta', 'Moon', 160), ('Chitra', 'Mars', 173.20), ('Swati', 'Rahu', 186.40),
-    ('Vishakha', 'Jupiter', 200), ('Anuradha', 'Saturn', 213.20), ('Jyeshtha', 'Mercury', 226.40),
-    ('Mula', 'Ketu', 240), ('Purva Ashadha', 'Venus', 253.20), ('Uttara Ashadha', 'Sun', 266.40),
-    ('Shravana', 'Moon', 280), ('Dhanishta', 'Mars', 293.20), ('Shatabhisha', 'Rahu', 306.40),
-    ('Purva Bhadrapada', 'Jupiter', 320), ('Uttara Bhadrapada', 'Saturn', 333.20), ('Revati', 'Mercury', 346.40)
-]
-
-def convert_divisional_charts_to_numbers(charts):
+# Ephemeris files are read lazily from a local directory and never downloaded;
+# strict mode checks them all against the manifest before serving
+if resources.STRICT:
+    resources.verify_resources()
+resources.configure_swisseph()
+
+def parse_choices(value, allowed, default, label):
+    """
+    Validate a request field naming one or more of `allowed`, case-insensitively.
+
+    Returns a tuple of the canonical names in request order without repeats,
+    or `default` when the field is missing.
     """
-    Convert zodiac signs in divisional charts to their corresponding numbers
+    if value is None:
+        return tuple(default)
+    if isinstance(value, str):
+        value = [value]
+    names = {name.lower(): name for name in allowed}
+    choices = []
+    for choice in value:
+        name = names.get(str(choice).lower())
+        if name is None:
+            raise ValueError(f"Unsupported {label}: {choice}")
+        if name not in choices:
+            choices.append(name)
+    return tuple(choices)
+
+def parse_birth_data(data):
     """
-    return {
-        chart_type: ZODIAC_TO_NUMBER[sign]
-        for chart_type, sign in charts.items()
+    Read one birth record and return (julian_day, lat, lon, vargas, ephemeris, dasha)
+    """
+    birth_date = data["date_of_birth"]
+    birth_time = data["time_of_birth"]
+    lat = float(data["latitude"])
+    lon = float(data["longitude"])
+    vargas = parse_choices(data.get("vargas"), SHODASHAVARGA, DEFAULT_VARGAS, "divisional chart")
+    ephemeris = parse_ephemeris(data.get("ephemeris"))
+    dasha = parse_dasha(data.get("dasha"))
+
+    # Local time conversion to UTC
+    ist = pytz.timezone('Asia/Kolkata')
+    dt = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M")
+    dt = ist.localize(dt)
+    utc_time = dt.astimezone(pytz.UTC)
+
+    julian_day = swe.julday(utc_time.year, utc_time.month, utc_time.day,
+                           utc_time.hour + utc_time.minute/60.0)
+
+    return julian_day, lat, lon, vargas, ephemeris, dasha
+
+def compute_chart(julian_day, lat, lon, vargas, ephemeris=None, dasha=None, context=None):
+    """
+    The compact Chart for one birth, with its sunrise, sunset and optional dasha
+    """
+    if context is None:
+        context = ChartContext(julian_day, lat, lon, get_backend(ephemeris))
+    # Sunrise and sunset of the birth date at the birth place, before the chart
+    # takes its swe_calls from the context
+    sunrises, sunsets = rise_set(ist_dates(julian_day), lat, lon, context)
+    chart = build_chart(context, vargas)
+    chart.sunrise, chart.sunset = float(sunrises[0]), float(sunsets[0])
+    if dasha is not None:
+        # From the exact longitudes on the context, not the rounded ones in the kundli
+        chart.dasha = dasha_response(context, *dasha)
+    return chart
+
+def kundli_response(chart):
+    """
+    The /generate_kundli JSON for a Chart; the only place a chart becomes dicts
+    """
+    response = {
+        "meta": {
+            "status": "success",
+            "message": "Kundli generated successfully",
+            "ayanamsa": {
+                "value": chart.ayanamsa,
+                "type": "Lahiri"
+            },
+            "ephemeris": chart.ephemeris,
+            "swe_calls": chart.swe_calls
+        },
+        "kundli": chart.to_json()
     }
-
-def get_nakshatra(longitude):
-    nak_span = 13.333333333333334  # 360/27
-    nakshatra_index = int(longitude / nak_span)
-    return nakshatras[nakshatra_index]
-
-def get_house_from_rashi(rashi, lagna_rashi):
-    fixed_rashi_order = [
-        'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-        'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-    ]
-    return fixed_rashi_order.index(rashi) + 1
-
-def calculate_planetary_states(planet, rashi, degrees_in_rashi, speed, sun_position=None):
-    retro = False
-    combust = False
-    status = "Neutral"
-
-    if speed < 0:
-        retro = True
-    
-    if sun_position is not None and planet != 'Sun':
-        if abs(degrees_in_rashi - sun_position) < 8:
-            combust = True
-    
-    # Exaltation and Debilitation states
-    if planet == 'Sun':
-        status = "Exalted" if rashi == "Aries" else "Neutral"
-    elif planet == 'Moon':
-        status = "Exalted" if rashi == "Taurus" else "Debilitated" if rashi == "Scorpio" else "Neutral"
-    elif planet == 'Mars':
-        status = "Exalted" if rashi == "Capricorn" else "Debilitated" if rashi == "Cancer" else "Neutral"
-    elif planet == 'Mercury':
-        status = "Exalted" if rashi == "Virgo" else "Debilitated" if rashi == "Pisces" else "Neutral"
-    elif planet == 'Jupiter':
-        status = "Exalted" if rashi == "Cancer" else "Debilitated" if rashi == "Capricorn" else "Neutral"
-    elif planet == 'Venus':
-        status = "Exalted" if rashi == "Pisces" else "Debilitated" if rashi == "Virgo" else "Neutral"
-    elif planet == 'Saturn':
-        status = "Exalted" if rashi == "Libra" else "Debilitated" if rashi == "Aries" else "Neutral"
-    # Add rules for new planets
-    elif planet == 'Neptune':
-        status = "Exalted" if rashi == "Pisces" else "Debilitated" if rashi == "Virgo" else "Neutral"
-    elif planet == 'Uranus':
-        status = "Exalted" if rashi == "Aquarius" else "Debilitated" if rashi == "Leo" else "Neutral"
-    elif planet == 'Pluto':
-        status = "Exalted" if rashi == "Scorpio" else "Debilitated" if rashi == "Taurus" else "Neutral"
-
-    return {'retro': retro, 'combust': combust, 'status': status}
-
-def calculate_house_positions(jd, lat, lon):
-    flags = swe.FLG_SWIEPH
-    hsys = b'W'  # Whole Sign system
-    cusps, asc_mc = swe.houses_ex(jd, lat, lon, hsys, flags)
-    return list(cusps), asc_mc[0]
-
-def calculate_d2(total_degrees, planet):
-    base_rashi = int(total_degrees / 30)
-    degree_in_rashi = total_degrees % 30
-    
-    if planet in ['Sun', 'Jupiter']:
-        hora_rashi = 'Leo' if degree_in_rashi < 15 else 'Cancer'
-    else:
-        hora_rashi = 'Cancer' if degree_in_rashi < 15 else 'Leo'
-    
-    return hora_rashi
-
-def calculate_d4(total_degrees):
-    base_rashi = int(total_degrees / 30)
-    degree_in_rashi = total_degrees % 30
-    quarter = int(degree_in_rashi / 7.5)
-    
-    final_rashi_num = (base_rashi + (quarter * 3)) % 12
-    
-    fixed_rashi_order = [
-        'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-        'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-    ]
-    
-    return fixed_rashi_order[final_rashi_num]
-
-def calculate_d9(total_degrees, is_ascendant=False):
-    base_rashi = int(total_degrees / 30)
-    degree_in_rashi = total_degrees % 30
-    navamsa = int(degree_in_rashi / 3.333333)
-    
-    if base_rashi % 2 == 0:
-        start_rashi = base_rashi
-    else:
-        start_rashi = (base_rashi + 8) % 12
-    
-    initial_rashi_num = (start_rashi + navamsa) % 12
-    
-    if is_ascendant:
-        final_rashi_num = (initial_rashi_num) % 12
-    else:
-        final_rashi_num = (initial_rashi_num + 4) % 12
-    
-    fixed_rashi_order = [
-        'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-        'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-    ]
-    
-    return fixed_rashi_order[final_rashi_num]
-
-def calculate_d10(total_degrees):
-    base_rashi = int(total_degrees / 30)
-    degree_in_rashi = total_degrees % 30
-    division = int(degree_in_rashi / 3)
-    
-    is_odd_sign = (base_rashi % 2 == 0)
-    
-    if is_odd_sign:
-        start_rashi = base_rashi
-    else:
-        start_rashi = (base_rashi + 8) % 12
-    
-    final_rashi_num = (start_rashi + division) % 12
-    
-    fixed_rashi_order = [
-        'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-        'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-    ]
-    
-    return fixed_rashi_order[final_rashi_num]
-
-def calculate_d60(total_degrees, planet=None):
-    base_rashi = int(total_degrees / 30)
-    degree_in_rashi = total_degrees % 30
-    division = int(degree_in_rashi / 0.5)
-    
-    rashi_type = base_rashi % 3
-    
-    if rashi_type == 0:
-        start_rashi = base_rashi
-    elif rashi_type == 1:
-        start_rashi = (base_rashi + 4) % 12
-    else:
-        start_rashi = (base_rashi + 8) % 12
-    
-    zodiac_rounds = division // 5
-    remaining_divisions = division % 5
-    
-    final_rashi_num = (start_rashi + zodiac_rounds + remaining_divisions) % 12
-    
-    fixed_rashi_order = [
-        'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-        'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-    ]
-    
-    return fixed_rashi_order[final_rashi_num]
-
-def calculate_extended_planetary_info(julian_day, lat, lon):
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
-    ayanamsa = swe.get_ayanamsa(julian_day)
-    
-    houses, ascendant = calculate_house_positions(julian_day, lat, lon)
-    ascendant = (ascendant - ayanamsa) % 360
-    houses = [(h - ayanamsa) % 360 for h in houses]
-    
-    sanskrit_lagna_rashi = list(RASHI_TRANSLATION.keys())[int(ascendant / 30)]
-    lagna_rashi = RASHI_TRANSLATION[sanskrit_lagna_rashi]
-    
-    planetary_info = {}
-    
-    sun_flags = swe.FLG_SWIEPH | swe.FLG_SPEED
-    sun_info = swe.calc_ut(julian_day, swe.SUN, sun_flags)
-    sun_longitude = (sun_info[0][0] - ayanamsa) % 360
-    sun_position = sun_longitude % 30
-
-    def get_planet_info(planet_num, planet, julian_day, ayanamsa):
-        flags = swe.FLG_SWIEPH | swe.FLG_SPEED
-        planet_info = swe.calc_ut(julian_day, planet_num, flags)
-        
-        longitude = (planet_info[0][0] - ayanamsa) % 360
-        speed = planet_info[0][3]
-        
-        rashi_index = int(longitude / 30)
-        sanskrit_rashi = list(RASHI_TRANSLATION.keys())[rashi_index]
-        rashi = RASHI_TRANSLATION[sanskrit_rashi]
-        degrees_in_rashi = longitude % 30
-        
-        nakshatra_info = get_nakshatra(longitude)
-        states = calculate_planetary_states(planet, rashi, degrees_in_rashi, speed, sun_position)
-        
-        return {
-            'longitude': longitude,
-            'rashi': rashi,
-            'rashi_lord': rashis[rashi]['lord'],
-            'nakshatra': nakshatra_info[0],
-            'nakshatra_lord': nakshatra_info[1],
-            'degrees': round(degrees_in_rashi, 2),
-            'total_degrees': round(longitude, 2),
-            'retro': states['retro'],
-            'combust': states['combust'],
-            'status': states['status']
-            
-        }
-
-    planet_mappings = [
-        ('Sun', swe.SUN), ('Moon', swe.MOON), ('Mars', swe.MARS),
-        ('Mercury', swe.MERCURY), ('Venus', swe.VENUS), 
-        ('Jupiter', swe.JUPITER), ('Saturn', swe.SATURN),
-        # Add these new planets
-        ('Neptune', swe.NEPTUNE),
-        ('Uranus', swe.URANUS),
-        ('Pluto', swe.PLUTO)
-    ]
-
-    for planet, planet_num in planet_mappings:
-        planet_info = get_planet_info(planet_num, planet, julian_day, ayanamsa)
-        rashi = planet_info['rashi']
-        house_position = get_house_from_rashi(rashi, lagna_rashi)
-        
-        total_degrees = planet_info['total_degrees']
-        divisional_charts = {
-            'D2': calculate_d2(total_degrees, planet),
-            'D4': calculate_d4(total_degrees),
-            'D9': calculate_d9(total_degrees),
-            'D10': calculate_d10(total_degrees),
-            'D60': calculate_d60(total_degrees, planet)
-        }
-        
-        # Convert divisional charts to numbers
-        divisional_charts = convert_divisional_charts_to_numbers(divisional_charts)
-        
-        planetary_info[planet] = {
-            'rashi': rashi,
-            'rashi_lord': planet_info['rashi_lord'],
-            'nakshatra': planet_info['nakshatra'],
-            'nakshatra_lord': planet_info['nakshatra_lord'],
-            'degrees': planet_info['degrees'],
-            'total_degrees': planet_info['total_degrees'],
-            'retro': planet_info['retro'],
-            'combust': planet_info['combust'],
-            'status': planet_info['status'],
-            'house': house_position,
-            'divisional_charts': divisional_charts
+    sun_times = describe_rise_set(
+        ist_dates([chart.julian_day]), np.array([chart.sunrise]), np.array([chart.sunset])
+    )[0]
+    response["sunrise_time"] = sun_times["sunrise_time"]
+    response["sunset_time"] = sun_times["sunset_time"]
+    if chart.dasha is not None:
+        response["dasha"] = chart.dasha
+    return response
+
+def compute_kundli_response(julian_day, lat, lon, vargas, ephemeris=None, dasha=None):
+    return kundli_response(compute_chart(julian_day, lat, lon, vargas, ephemeris, dasha))
+
+def error_response(e):
+    return {
+        "meta": {
+            "status": "error",
+            "message": str(e)
         }
-
-    # Calculate Rahu and Ketu
-    rahu_info = get_planet_info(swe.MEAN_NODE, 'Rahu', julian_day, ayanamsa)
-    rahu_house = get_house_from_rashi(rahu_info['rashi'], lagna_rashi)
-    
-    # Calculate divisional charts for Rahu
-    rahu_divisional_charts = {
-        'D2': calculate_d2(rahu_info['total_degrees'], 'Rahu'),
-        'D4': calculate_d4(rahu_info['total_degrees']),
-        'D9': calculate_d9(rahu_info['total_degrees']),
-        'D10': calculate_d10(rahu_info['total_degrees']),
-        'D60': calculate_d60(rahu_info['total_degrees'], 'Rahu')
-    }
-    
-    # Convert Rahu's divisional charts to numbers
-    rahu_divisional_charts = convert_divisional_charts_to_numbers(rahu_divisional_charts)
-    
-    planetary_info['Rahu'] = {
-        'rashi': rahu_info['rashi'],
-        'rashi_lord': rashis[rahu_info['rashi']]['lord'],
-        'nakshatra': rahu_info['nakshatra'],
-        'nakshatra_lord': rahu_info['nakshatra_lord'],
-        'degrees': rahu_info['degrees'],
-        'total_degrees': rahu_info['total_degrees'],
-        'retro': True,
-        'combust': False,
-        'status': 'Neutral',
-        'house': rahu_house,
-        'divisional_charts': rahu_divisional_charts
     }
 
-    # Calculate Ketu position
-    ketu_longitude = (rahu_info['total_degrees'] + 180) % 360
-    ketu_rashi_index = int(ketu_longitude / 30)
-    sanskrit_ketu_rashi = list(RASHI_TRANSLATION.keys())[ketu_rashi_index]
-    ketu_rashi = RASHI_TRANSLATION[sanskrit_ketu_rashi]
-    ketu_house = get_house_from_rashi(ketu_rashi, lagna_rashi)
-    ketu_degrees = ketu_longitude % 30
-    ketu_nakshatra = get_nakshatra(ketu_longitude)
-    
-    # Calculate divisional charts for Ketu
-    ketu_divisional_charts = {
-        'D2': calculate_d2(ketu_longitude, 'Ketu'),
-        'D4': calculate_d4(ketu_longitude),
-        'D9': calculate_d9(ketu_longitude),
-        'D10': calculate_d10(ketu_longitude),
-        'D60': calculate_d60(ketu_longitude, 'Ketu')
-    }
-    
-    # Convert Ketu's divisional charts to numbers
-    ketu_divisional_charts = convert_divisional_charts_to_numbers(ketu_divisional_charts)
-
-    planetary_info['Ketu'] = {
-        'rashi': ketu_rashi,
-        'rashi_lord': rashis[ketu_rashi]['lord'],
-        'nakshatra': ketu_nakshatra[0],
-        'nakshatra_lord': ketu_nakshatra[1],
-        'degrees': round(ketu_degrees, 2),
-        'total_degrees': round(ketu_longitude, 2),
-        'retro': True,
-        'combust': False,
-        'status': 'Neutral',
-        'house': ketu_house,
-        'divisional_charts': ketu_divisional_charts
-    }
+def error_status(e):
+    """
+    HTTP status for a failed request: 503 when the worker pool failed it, else 400
+    """
+    return 503 if isinstance(e, BrokenProcessPool) else 400
 
-    # Ascendant Details
-    sanskrit_ascendant_rashi = list(RASHI_TRANSLATION.keys())[int(ascendant / 30)]
-    ascendant_rashi = RASHI_TRANSLATION[sanskrit_ascendant_rashi]
-    ascendant_nakshatra = get_nakshatra(ascendant)
-    
-    # Calculate divisional charts for Ascendant
-    ascendant_divisional_charts = {
-        'D2': calculate_d2(ascendant, 'Ascendant'),
-        'D4': calculate_d4(ascendant),
-        'D9': calculate_d9(ascendant, is_ascendant=True),
-        'D10': calculate_d10(ascendant),
-        'D60': calculate_d60(ascendant, 'Ascendant')
-    }
-    
-    # Convert Ascendant's divisional charts to numbers
-    ascendant_divisional_charts = convert_divisional_charts_to_numbers(ascendant_divisional_charts)
-    
-    planetary_info['Ascendant'] = {
-        'rashi': ascendant_rashi,
-        'rashi_lord': rashis[ascendant_rashi]['lord'],
-        'degrees': round(ascendant % 30, 2),
-        'total_degrees': round(ascendant, 2),
-        'nakshatra': ascendant_nakshatra[0],
-        'nakshatra_lord': ascendant_nakshatra[1],
-        'house': get_house_from_rashi(ascendant_rashi, lagna_rashi),
-        'divisional_charts': ascendant_divisional_charts
-    }
+def generate_batch_chunk(records):
+    """
+    Process-pool task: a slice of batch records in, their Charts (or error dicts) out
 
-    return planetary_info
+    The chunk's body positions are read with one vectorized backend call per
+    body before any chart is built.
+    """
+    results = [None] * len(records)
+    births = {}
+    for i, data in enumerate(records):
+        try:
+            birth = parse_birth_data(data)
+            julian_day, lat, lon, _, ephemeris, _ = birth
+            births[i] = birth, ChartContext(julian_day, lat, lon, get_backend(ephemeris))
+        except Exception as e:
+            results[i] = error_response(e)
+
+    prefetch_bodies([context for _, context in births.values()], CHART_PLANETS)
+    for i, (birth, context) in births.items():
+        try:
+            results[i] = compute_chart(*birth, context=context)
+        except Exception as e:
+            results[i] = error_response(e)
+    return results
+
+def batch_item_response(result):
+    return kundli_response(result) if isinstance(result, Chart) else result
+
+# All chart computation goes through the executor, which keeps swisseph's global
+# state isolated per worker process (or serialized, in inline mode)
+BATCH_MAX_RECORDS = int(os.environ.get('KUNDLI_BATCH_MAX_RECORDS', 10000))
+executor = ChartExecutor(
+    mode=os.environ.get('KUNDLI_EXECUTOR', 'process'),
+    workers=int(os.environ.get('KUNDLI_WORKERS', os.cpu_count() or 1)),
+    chunksize=int(os.environ.get('KUNDLI_BATCH_CHUNK_SIZE', 16))
+)
+
+# Bump whenever a change alters chart output, so cached results are not served
+ALGORITHM_VERSION = 7
+# Per-process LRU, backed by a SQLite file shared by all workers on the host when
+# KUNDLI_CACHE_DB is set
+chart_cache = TieredCache(
+    LRUCache(int(os.environ.get('KUNDLI_CACHE_SIZE', 10000))),
+    SQLiteCache(
+        os.environ['KUNDLI_CACHE_DB'],
+        ttl=float(os.environ.get('KUNDLI_CACHE_DB_TTL', 30 * 24 * 3600)),
+        max_entries=int(os.environ.get('KUNDLI_CACHE_DB_MAX_ENTRIES', 1000000))
+    ) if os.environ.get('KUNDLI_CACHE_DB') else None
+)
+
+# Identical requests arriving together wait on one computation
+inflight_charts = SingleFlight()
+
+def _compute_and_cache(key, julian_day, lat, lon, vargas, ephemeris, dasha):
+    # Workers return the compact Chart; it becomes JSON here, in the web process
+    chart = executor.run(compute_chart, julian_day, lat, lon, vargas, ephemeris, dasha)
+    response = kundli_response(chart)
+    chart_cache.put(key, response)
+    return response
+
+def get_kundli_response(julian_day, lat, lon, vargas, ephemeris, dasha):
+    """
+    Cached, coalesced front for compute_kundli_response, keyed by canonical birth input
+    """
+    key = chart_cache_key(julian_day, lat, lon, vargas, dasha, 'Lahiri', ephemeris, ALGORITHM_VERSION)
+    response = chart_cache.get(key)
+    if response is None:
+        response = inflight_charts.do(
+            key, _compute_and_cache, key, julian_day, lat, lon, vargas, ephemeris, dasha
+        )
+    return response
 
 @app.route('/generate_kundli', methods=['POST'])
 def generate_kundli():
+    try:
+        return jsonify(get_kundli_response(*parse_birth_data(request.get_json())))
+    except Exception as e:
+        return jsonify(error_response(e)), error_status(e)
+
+@app.route('/generate_kundli/batch', methods=['POST'])
+def generate_kundli_batch():
     try:
         data = request.get_json()
-        birth_date = data["date_of_birth"]
-        birth_time = data["time_of_birth"]
-        lat = float(data["latitude"])
-        lon = float(data["longitude"])
+        records = data["records"] if isinstance(data, dict) else data
+        if not isinstance(records, list):
+            raise ValueError("Expected a list of birth records")
+        if len(records) > BATCH_MAX_RECORDS:
+            raise ValueError(f"Batch exceeds {BATCH_MAX_RECORDS} records")
+
+        # Newline-delimited JSON, one line per record, via {"stream": true} or ?stream=1
+        stream = request.args.get("stream") == "1" or (isinstance(data, dict) and data.get("stream"))
+        if stream:
+            return Response(stream_with_context(
+                app.json.dumps(batch_item_response(result)) + "\n"
+                for result in executor.map_chunks(generate_batch_chunk, records)
+            ), mimetype='application/x-ndjson')
+
+        results = [batch_item_response(result) for result in executor.map_chunks(generate_batch_chunk, records)]
+        failed = sum(1 for result in results if result["meta"]["status"] == "error")
 
-        # Local time conversion to UTC
-        ist = pytz.timezone('Asia/Kolkata')
-        dt = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M")
-        dt = ist.localize(dt)
-        utc_time = dt.astimezone(pytz.UTC)
+        return jsonify({
+            "meta": {
+                "status": "success",
+                "message": "Batch generated successfully",
+                "count": len(results),
+                "failed": failed
+            },
+            "results": results
+        })
+    except Exception as e:
+        return jsonify(error_response(e)), error_status(e)
 
-        julian_day = swe.julday(utc_time.year, utc_time.month, utc_time.day,
-                               utc_time.hour + utc_time.minute/60.0)
+# Transit series: whole range capped, and streamed in slices of this many instants
+TRANSITS_MAX_POINTS = int(os.environ.get('KUNDLI_TRANSITS_MAX_POINTS', 100000))
+TRANSITS_CHUNK_POINTS = int(os.environ.get('KUNDLI_TRANSITS_CHUNK_POINTS', 2000))
 
-        planetary_info = calculate_extended_planetary_info(julian_day, lat, lon)
+@app.route('/transits', methods=['POST'])
+def transits():
+    """
+    Columnar sidereal positions for a list of bodies from `start` to `end` every `step`
+    """
+    try:
+        data = request.get_json()
+        julian_days = transit_julian_days(
+            parse_ist(data["start"]), parse_ist(data["end"]), parse_step(data.get("step", "1d")),
+            TRANSITS_MAX_POINTS
+        )
+        bodies = parse_choices(data.get("bodies"), BODIES, BODIES, "body")
+        ephemeris = parse_ephemeris(data.get("ephemeris"))
+
+        # Newline-delimited JSON, one columnar slice per line, via {"stream": true} or ?stream=1
+        stream = request.args.get("stream") == "1" or data.get("stream")
+        if stream:
+            def slices():
+                for i in range(0, len(julian_days), TRANSITS_CHUNK_POINTS):
+                    chunk = julian_days[i:i + TRANSITS_CHUNK_POINTS]
+                    yield app.json.dumps(executor.run(compute_transits, chunk, bodies, ephemeris)) + "\n"
+            return Response(stream_with_context(slices()), mimetype='application/x-ndjson')
 
         return jsonify({
             "meta": {
                 "status": "success",
-                "message": "Kundli generated successfully",
-                "ayanamsa": {
-                    "value": swe.get_ayanamsa(julian_day),
-                    "type": "Lahiri"
-                }
+                "message": "Transits generated successfully",
+                "count": len(julian_days),
+                "ephemeris": ephemeris
             },
-            "kundli": planetary_info
+            "transits": executor.run(compute_transits, julian_days, bodies, ephemeris)
         })
     except Exception as e:
+        return jsonify(error_response(e)), error_status(e)
+
+# Ingress events are computed a calendar year per body at a time and kept in memory
+EVENTS_MAX_YEARS = int(os.environ.get('KUNDLI_EVENTS_MAX_YEARS', 10))
+ingress_tables = YearTables(
+    ingress_table, LRUCache(int(os.environ.get('KUNDLI_EVENT_CACHE_SIZE', 1024))), executor
+)
+
+def parse_date_range(data, name):
+    """
+    (start, end) Julian days of the `start` and `end` fields, at most EVENTS_MAX_YEARS apart
+    """
+    start, end = parse_ist(data["start"]), parse_ist(data["end"])
+    if end < start:
+        raise ValueError(f"{name} range ends before it starts")
+    if end - start > EVENTS_MAX_YEARS * 366:
+        raise ValueError(f"{name} range exceeds {EVENTS_MAX_YEARS} years")
+    return start, end
+
+@app.route('/events', methods=['POST'])
+def events():
+    """
+    Sign, nakshatra and pada ingresses of a list of bodies between `start` and `end`
+    """
+    try:
+        data = request.get_json()
+        start, end = parse_date_range(data, "Event")
+        bodies = parse_choices(data.get("bodies"), BODIES, BODIES, "body")
+        divisions = parse_choices(data.get("types"), DIVISIONS, DIVISIONS, "event type")
+        ephemeris = parse_ephemeris(data.get("ephemeris"))
+
+        found = [
+            event for event in ingress_tables.get(start, end, *((body, ephemeris) for body in bodies))
+            if event["type"] in divisions
+        ]
         return jsonify({
             "meta": {
-                "status": "error",
-                "message": str(e)
-            }
-        }), 400
+                "status": "success",
+                "message": "Events found successfully",
+                "count": len(found),
+                "ephemeris": ephemeris
+            },
+            "events": found
+        })
+    except Exception as e:
+        return jsonify(error_response(e)), error_status(e)
+
+# Stations are computed a calendar year per planet at a time, like ingresses
+station_tables = YearTables(
+    station_table, LRUCache(int(os.environ.get('KUNDLI_EVENT_CACHE_SIZE', 1024))), executor
+)
+
+@app.route('/stations', methods=['POST'])
+def stations():
+    """
+    Stations and retrograde periods of Mercury to Pluto between `start` and `end`
+    """
+    try:
+        data = request.get_json()
+        start, end = parse_date_range(data, "Station")
+        bodies = parse_choices(data.get("bodies"), STATION_BODIES, STATION_BODIES, "station body")
+        ephemeris = parse_ephemeris(data.get("ephemeris"))
+
+        # A year either side catches retrograde periods running over the range edges
+        found = station_tables.get(start - 366, end + 366, *((body, ephemeris) for body in bodies))
+        periods = [period for period in retrograde_periods(found) if period["end"] >= start and period["start"] < end]
+        found = [station for station in found if start <= station["julian_day"] < end]
+        return jsonify({
+            "meta": {
+                "status": "success",
+                "message": "Stations found successfully",
+                "count": len(found),
+                "ephemeris": ephemeris
+            },
+            "stations": found,
+            "retrograde_periods": periods
+        })
+    except Exception as e:
+        return jsonify(error_response(e)), error_status(e)
+
+@app.route('/combustion', methods=['POST'])
+def combustion():
+    """
+    Windows in which the Moon, Mars, Mercury, Jupiter, Venus or Saturn are combust
+    between `start` and `end`
+    """
+    try:
+        data = request.get_json()
+        start, end = parse_date_range(data, "Combustion")
+        bodies = parse_choices(data.get("bodies"), COMBUSTION_BODIES, COMBUSTION_BODIES, "combustion body")
+        ephemeris = parse_ephemeris(data.get("ephemeris"))
+
+        futures = [executor.submit(find_combustions, body, start, end, ephemeris) for body in bodies]
+        windows = [window for future in futures for window in future.result()]
+        windows.sort(key=lambda window: window["start"] if window["start"] is not None else start)
+        return jsonify({
+            "meta": {
+                "status": "success",
+                "message": "Combustion windows found successfully",
+                "count": len(windows),
+                "ephemeris": ephemeris
+            },
+            "combustions": windows
+        })
+    except Exception as e:
+        return jsonify(error_response(e)), error_status(e)
+
+# Daily panchang is computed a calendar year at a time, like ingresses
+panchang_tables = YearTables(
+    panchang_year, LRUCache(int(os.environ.get('KUNDLI_PANCHANG_CACHE_SIZE', 64))), executor
+)
+
+@app.route('/panchang', methods=['POST'])
+def panchang_route():
+    """
+    Panchang at `latitude`/`longitude` for a `date` or every date from `start` to `end`.
+
+    Days are reckoned from sunrise; a `date` with a time gives the panchang at that instant.
+    """
+    try:
+        data = request.get_json()
+        lat = float(data["latitude"])
+        lon = float(data["longitude"])
+        ephemeris = parse_ephemeris(data.get("ephemeris"))
+        if "date" in data:
+            date = str(data["date"]).strip()
+            if ' ' in date:
+                days = executor.run(panchang, [parse_ist(date)], ephemeris)
+            else:
+                days = executor.run(daily_panchang, [ist_dates(parse_ist(date))], lat, lon, ephemeris)
+        else:
+            start, end = parse_date_range(data, "Panchang")
+            # Inclusive of the end date
+            days = panchang_tables.get(start, end + 1, (*quantize_location(lat, lon), ephemeris))
+        return jsonify({
+            "meta": {
+                "status": "success",
+                "message": "Panchang calculated successfully",
+                "count": len(days),
+                "ephemeris": ephemeris
+            },
+            "panchang": days
+        })
+    except Exception as e:
+        return jsonify(error_response(e)), error_status(e)
+
+@app.route('/sun', methods=['POST'])
+def sun():
+    """
+    Sunrise, sunset and day length at `latitude`/`longitude` for a `date` or a `start`/`end` range
+    """
+    try:
+        data = request.get_json()
+        lat = float(data["latitude"])
+        lon = float(data["longitude"])
+        if "date" in data:
+            start = end = parse_ist(data["date"])
+        else:
+            start, end = parse_date_range(data, "Sun")
+        dates = np.arange(ist_dates(start), ist_dates(end) + 0.5)
+        sunrises, sunsets = executor.run(rise_set, dates, lat, lon)
+        days = describe_rise_set(dates, sunrises, sunsets)
+        return jsonify({
+            "meta": {
+                "status": "success",
+                "message": "Sun times calculated successfully",
+                "count": len(days),
+                "location": quantize_location(lat, lon)
+            },
+            "days": days
+        })
+    except Exception as e:
+        return jsonify(error_response(e)), error_status(e)
+
+MATCH_MAX_CANDIDATES = int(os.environ.get('KUNDLI_MATCH_MAX_CANDIDATES', 100000))
+
+@app.route('/match', methods=['POST'])
+def match_route():
+    """
+    Ashtakoota scores of one `profile` against a list of `candidates`.
+
+    Each is a birth record (date_of_birth, time_of_birth) or carries a
+    moon_longitude or a kundli; the profile also gives its gender. `top` keeps only the
+    best K matches.
+    """
+    try:
+        data = request.get_json()
+        profile = data["profile"]
+        candidates = data["candidates"]
+        if not isinstance(candidates, list):
+            raise ValueError("candidates must be a list")
+        if len(candidates) > MATCH_MAX_CANDIDATES:
+            raise ValueError(f"Match exceeds {MATCH_MAX_CANDIDATES} candidates")
+        top = int(data["top"]) if data.get("top") is not None else None
+        if top is not None and top < 1:
+            raise ValueError("top must be at least 1")
+        ephemeris = parse_ephemeris(data.get("ephemeris"))
+
+        result = executor.run(match, profile, candidates, ephemeris, top)
+        return jsonify({
+            "meta": {
+                "status": "success",
+                "message": "Matches scored successfully",
+                "count": len(result["matches"]),
+                "ephemeris": ephemeris
+            },
+            **result
+        })
+    except Exception as e:
+        return jsonify(error_response(e)), error_status(e)
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify({
+        "cache": chart_cache.stats(),
+        "singleflight": inflight_charts.stats(),
+        "events": ingress_tables.cache.stats(),
+        "stations": station_tables.cache.stats(),
+        "panchang": panchang_tables.cache.stats()
+    })
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
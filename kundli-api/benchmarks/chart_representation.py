@@ -0,0 +1,207 @@
+"""
+Compact Chart vs the kundli dicts it replaced: allocations, pickled size and batch throughput.
+
+For N random births, compares build_chart (the structured-array Chart) with
+the dict builder /generate_kundli used before it, copied here as
+legacy_kundli: memory at peak while building one chart and held per finished
+chart (tracemalloc), and bytes pickled per chart (what a worker sends back to
+the web process). Then times batches through the executor's map_chunks, with
+workers returning Charts that the web process turns into JSON, vs workers
+returning the legacy response dicts.
+
+    python benchmarks/chart_representation.py --records 2000 --workers 4
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from chart import build_chart  # noqa: E402
+from chart_context import ChartContext  # noqa: E402
+from combustion import is_combust  # noqa: E402
+from dignity import BODY_INDEX, DIGNITIES, body_dignity, statuses  # noqa: E402
+from ephemeris import get_backend  # noqa: E402
+from executor import ChartExecutor  # noqa: E402
+from riseset import describe_rise_set, ist_dates, rise_set  # noqa: E402
+from vargas import calculate_vargas  # noqa: E402
+from zodiac import BODIES, RASHI_ORDER, nakshatras, rashis  # noqa: E402
+
+
+def legacy_kundli(context, vargas):
+    """
+    The `kundli` dicts as built before Charts: one dict per body, filled body by body
+    """
+    ascendant = context.ascendant
+    sun_longitude, _ = context.body(BODIES['Sun'])
+
+    def planet_info(planet, longitude, speed):
+        rashi = RASHI_ORDER[int(longitude / 30)]
+        nakshatra = nakshatras[int(longitude / 13.333333333333334)]
+        dignity = body_dignity(planet, longitude)
+        return {
+            'rashi': rashi,
+            'rashi_lord': rashis[rashi]['lord'],
+            'nakshatra': nakshatra[0],
+            'nakshatra_lord': nakshatra[1],
+            'degrees': round(longitude % 30, 2),
+            'total_degrees': round(longitude, 2),
+            'retro': speed < 0,
+            'combust': is_combust(planet, longitude, speed, sun_longitude),
+            'status': DIGNITIES[int(statuses(BODY_INDEX[planet], longitude))],
+            'dignity': dignity,
+            'house': RASHI_ORDER.index(rashi) + 1
+        }
+
+    kundli = {}
+    for planet in ('Sun', 'Moon', 'Mars', 'Mercury', 'Venus', 'Jupiter', 'Saturn', 'Neptune', 'Uranus', 'Pluto'):
+        kundli[planet] = planet_info(planet, *context.body(BODIES[planet]))
+    rahu_longitude, rahu_speed = context.body(BODIES['Rahu'])
+    kundli['Rahu'] = planet_info('Rahu', rahu_longitude, rahu_speed)
+    ketu_longitude = (kundli['Rahu']['total_degrees'] + 180) % 360
+    kundli['Ketu'] = planet_info('Ketu', ketu_longitude, rahu_speed)
+    for node in ('Rahu', 'Ketu'):
+        kundli[node]['retro'] = True
+
+    rashi = RASHI_ORDER[int(ascendant / 30)]
+    nakshatra = nakshatras[int(ascendant / 13.333333333333334)]
+    kundli['Ascendant'] = {
+        'rashi': rashi,
+        'rashi_lord': rashis[rashi]['lord'],
+        'degrees': round(ascendant % 30, 2),
+        'total_degrees': round(ascendant, 2),
+        'nakshatra': nakshatra[0],
+        'nakshatra_lord': nakshatra[1],
+        'house': RASHI_ORDER.index(rashi) + 1
+    }
+
+    bodies = list(kundli)
+    longitudes = [kundli[body]['total_degrees'] for body in bodies]
+    longitudes[bodies.index('Ketu')] = ketu_longitude
+    longitudes[bodies.index('Ascendant')] = ascendant
+    charts = calculate_vargas(longitudes, bodies, np.array(bodies) == 'Ascendant', vargas)
+    for i, body in enumerate(bodies):
+        kundli[body]['divisional_charts'] = {chart_type: int(signs[i]) for chart_type, signs in charts.items()}
+    return kundli
+
+
+def legacy_response(julian_day, lat, lon, vargas, ephemeris=None, dasha=None):
+    """
+    The full /generate_kundli response as workers returned it before Charts
+    """
+    backend = get_backend(ephemeris)
+    context = ChartContext(julian_day, lat, lon, backend)
+    response = {
+        "meta": {
+            "status": "success",
+            "message": "Kundli generated successfully",
+            "ayanamsa": {"value": context.ayanamsa, "type": "Lahiri"},
+            "ephemeris": backend.name,
+            "swe_calls": context.swe_calls
+        },
+        "kundli": legacy_kundli(context, vargas)
+    }
+    sunrises, sunsets = rise_set(ist_dates(julian_day), lat, lon)
+    sun_times = describe_rise_set(ist_dates([julian_day]), sunrises, sunsets)[0]
+    response["sunrise_time"] = sun_times["sunrise_time"]
+    response["sunset_time"] = sun_times["sunset_time"]
+    return response
+
+
+def legacy_chunk(records):
+    """
+    Process-pool task returning the legacy response dicts
+    """
+    results = []
+    for data in records:
+        try:
+            results.append(legacy_response(*app.parse_birth_data(data)))
+        except Exception as e:
+            results.append(app.error_response(e))
+    return results
+
+
+def random_records(count, seed):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            'date_of_birth': f"{rng.integers(1920, 2080)}-{rng.integers(1, 13):02d}-{rng.integers(1, 29):02d}",
+            'time_of_birth': f"{rng.integers(0, 24):02d}:{rng.integers(0, 60):02d}",
+            'latitude': str(round(rng.uniform(-50, 60), 4)),
+            'longitude': str(round(rng.uniform(-120, 150), 4))
+        }
+        for _ in range(count)
+    ]
+
+
+def allocations(build, births):
+    """
+    (mean KB at peak while building one chart, KB held per finished chart)
+    """
+    tracemalloc.start()
+    results, peaks = [], []
+    for julian_day, lat, lon, vargas, ephemeris, _ in births:
+        context = ChartContext(julian_day, lat, lon, get_backend(ephemeris))
+        context.ascendant
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        results.append(build(context, vargas))
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        del context
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return np.mean(peaks) / 1024, held / len(births) / 1024
+
+
+def throughput(executor, task, records, convert):
+    started = time.perf_counter()
+    for result in executor.map_chunks(task, records):
+        convert(result)
+    return len(records) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--records', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunksize', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    records = random_records(args.records, args.seed)
+    births = [app.parse_birth_data(data) for data in records]
+    contexts = [ChartContext(julian_day, lat, lon, get_backend(ephemeris))
+                for julian_day, lat, lon, vargas, ephemeris, _ in births]
+    charts = [build_chart(context, birth[3]) for context, birth in zip(contexts, births)]
+    legacy = [legacy_kundli(context, birth[3]) for context, birth in zip(contexts, births)]
+    mismatches = sum(chart.to_json() != kundli for chart, kundli in zip(charts, legacy))
+
+    print(f"{args.records} charts, {mismatches} differing from the legacy builder")
+    print(f"{'representation':>16s} {'peak KB/chart':>14s} {'held KB/chart':>14s} {'pickled B/chart':>16s}")
+    for label, build, results in (('Chart', build_chart, charts), ('legacy dicts', legacy_kundli, legacy)):
+        peak, held = allocations(build, births)
+        pickled = np.mean([len(pickle.dumps(result, pickle.HIGHEST_PROTOCOL)) for result in results])
+        print(f"{label:>16s} {peak:14.1f} {held:14.1f} {pickled:16.0f}")
+
+    executor = ChartExecutor(mode='process', workers=args.workers, chunksize=args.chunksize)
+    try:
+        # Start the workers before timing
+        list(executor.map_chunks(app.generate_batch_chunk, records[:args.workers * args.chunksize]))
+        print(f"\nbatch through {args.workers} workers, chunks of {args.chunksize}")
+        print(f"{'workers return':>16s} {'charts/s':>10s}")
+        for label, task, convert in (('Chart', app.generate_batch_chunk, app.batch_item_response),
+                                     ('legacy dicts', legacy_chunk, lambda result: result)):
+            print(f"{label:>16s} {throughput(executor, task, records, convert):10.0f}")
+    finally:
+        executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Throughput of each ephemeris backend and its agreement with swisseph.
+
+Every backend computes the same random instants (1900-2050) for every body in
+one `positions` call per body; the report gives positions per second and the
+longitude difference from swisseph in arc-seconds. Backends whose data is not
+installed (no grid built, no de421.bsp in KUNDLI_EPHE_DIR) are skipped.
+
+    python benchmarks/ephemeris_backends.py --samples 20000
+    python benchmarks/ephemeris_backends.py --backends swisseph skyfield
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import swisseph as swe
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ephemeris import BACKENDS, get_backend  # noqa: E402
+
+START, END = 2415020.5, 2469807.5  # 1900-01-01 .. 2050-01-01
+
+BODIES = {
+    'Sun': swe.SUN, 'Moon': swe.MOON, 'Mars': swe.MARS, 'Mercury': swe.MERCURY,
+    'Venus': swe.VENUS, 'Jupiter': swe.JUPITER, 'Saturn': swe.SATURN,
+    'Uranus': swe.URANUS, 'Neptune': swe.NEPTUNE, 'Pluto': swe.PLUTO
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--samples', type=int, default=10000)
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    julian_days = np.random.default_rng(args.seed).uniform(START, END, args.samples)
+    reference = {name: get_backend('swisseph').positions(body, julian_days)
+                 for name, body in BODIES.items()}
+
+    for backend_name in args.backends:
+        try:
+            backend = get_backend(backend_name)
+        except Exception as e:
+            print(f"{backend_name}: skipped ({e})")
+            continue
+
+        print(f"{backend_name}")
+        elapsed = 0.0
+        for name, body in BODIES.items():
+            started = time.perf_counter()
+            longitudes, speeds = backend.positions(body, julian_days)
+            elapsed += time.perf_counter() - started
+
+            error = np.abs((longitudes - reference[name][0] + 180) % 360 - 180) * 3600
+            speed_error = np.abs(speeds - reference[name][1]) * 3600
+            print(f"  {name:8s} longitude max {error.max():9.3f}\"  median {np.median(error):9.3f}\"  "
+                  f"speed max {speed_error.max():9.3f}\"/day")
+        rate = args.samples * len(BODIES) / elapsed
+        print(f"  {rate:,.0f} positions/s ({elapsed:.2f}s for {args.samples * len(BODIES):,})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Ashtakoota scoring throughput: one profile against N candidates.
+
+Candidates carry random Moon longitudes, so the timings cover the table lookups
+(score_kootas) and the full match() including building the result rows, not
+the ephemeris.
+
+    python benchmarks/matching.py --candidates 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matching import match, score_kootas  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--top', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    longitudes = np.random.default_rng(args.seed).uniform(0, 360, args.candidates)
+    candidates = [{'id': i, 'moon_longitude': longitude} for i, longitude in enumerate(longitudes.tolist())]
+    profile = {'gender': 'male', 'moon_longitude': 123.4}
+
+    started = time.perf_counter()
+    scores = score_kootas(profile['moon_longitude'], longitudes)
+    totals = sum(scores.values())
+    scored = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = match(profile, candidates, top=args.top)
+    matched = time.perf_counter() - started
+
+    print(f"candidates       {args.candidates:,}")
+    print(f"score_kootas     {scored * 1000:8.1f} ms  ({args.candidates / scored:,.0f} pairs/s)")
+    print(f"match            {matched * 1000:8.1f} ms  ({len(result['matches']):,} rows)")
+    print(f"mean total       {totals.mean():8.2f} / {result['max_points']}")
+
+
+if __name__ == '__main__':
+    main()
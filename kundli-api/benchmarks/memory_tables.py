@@ -0,0 +1,82 @@
+"""
+Per-worker memory of the ephemeris grid: loaded .npz vs memory-mapped .npy directory.
+
+Starts N worker processes per format, has each one answer the same random
+position queries, and reports RSS and PSS (RSS with shared pages split between
+the processes mapping them) per worker while all of them are alive.
+
+    python benchmarks/memory_tables.py --grid tables/ephemeris_grid --workers 8
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from ephemeris_grid import EphemerisGrid
+from tables import load_tables
+
+
+def memory_kb():
+    with open('/proc/self/status') as f:
+        rss = next(int(line.split()[1]) for line in f if line.startswith('VmRSS:'))
+    with open('/proc/self/smaps_rollup') as f:
+        pss = next(int(line.split()[1]) for line in f if line.startswith('Pss:'))
+    return rss, pss
+
+
+def worker(path, queries, loaded, measured, results):
+    baseline = memory_kb()
+    if path is not None:
+        grid = EphemerisGrid.load(path)
+        rng = np.random.default_rng(os.getpid())
+        julian_days = rng.uniform(grid.start, grid.end, queries)
+        for planet_num in grid.bodies:
+            grid.positions(planet_num, julian_days)
+    loaded.wait()
+    rss, pss = memory_kb()
+    results.put((rss - baseline[0], pss - baseline[1]))
+    measured.wait()
+
+
+def measure(path, workers, queries):
+    ctx = multiprocessing.get_context('spawn')
+    loaded, measured = ctx.Barrier(workers, timeout=300), ctx.Barrier(workers, timeout=300)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=worker, args=(path, queries, loaded, measured, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return np.mean(samples, axis=0) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--grid', default='tables/ephemeris_grid',
+                        help='grid directory written by `tables.py build`')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        npz = os.path.join(tmp, 'ephemeris_grid.npz')
+        np.savez_compressed(npz, **load_tables(args.grid))
+
+        print(f"{args.workers} workers, {args.queries} queries per body per worker")
+        print(f"{'format':>10s} {'RSS MB/worker':>14s} {'PSS MB/worker':>14s}")
+        for label, path in (('.npz', npz), ('memmap', args.grid)):
+            rss, pss = measure(path, args.workers, args.queries)
+            print(f"{label:>10s} {rss:14.1f} {pss:14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Cold-start benchmark: time from interpreter start to `import app` finishing and
+to the first chart being served, each in a fresh process.
+
+    python benchmarks/startup.py --runs 10
+    KUNDLI_EXECUTOR=inline python benchmarks/startup.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().post('/generate_kundli', json={
+    'date_of_birth': '1990-01-01', 'time_of_birth': '10:00',
+    'latitude': '28.6139', 'longitude': '77.2090'
+})
+assert response.status_code == 200, response.get_data(as_text=True)
+ready = time.perf_counter()
+app.executor.shutdown()
+print(json.dumps({'import': imported - started, 'first_chart': ready - started}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    samples = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE], cwd=APP_DIR, check=True,
+            capture_output=True, text=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"executor={os.environ.get('KUNDLI_EXECUTOR', 'process')} runs={args.runs}")
+    for key in ('import', 'first_chart'):
+        values = [sample[key] * 1000 for sample in samples]
+        print(f"{key:12s} median {statistics.median(values):8.1f} ms   max {max(values):8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Concurrency stress test for the chart executor.
+
+Serves app.py on a threaded WSGI server, fires a distinct birth record per
+request from many parallel clients while another thread keeps switching
+swisseph's sidereal mode in the server process, and checks every response is
+byte-identical to the one computed serially. The serial pass fills the chart
+cache, so the concurrent phase runs against a fresh, empty one and checks that
+every request was actually computed there.
+
+    python benchmarks/stress_concurrency.py --clients 64 --requests 2000
+    KUNDLI_EXECUTOR=inline python benchmarks/stress_concurrency.py
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import swisseph as swe
+from werkzeug.serving import make_server
+
+import app as kundli_app
+from cache import LRUCache, SingleFlight, TieredCache
+from executor import SWE_LOCK
+
+
+def random_records(count, seed):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        records.append({
+            "date_of_birth": f"{rng.randint(1920, 2080)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "time_of_birth": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+            "latitude": str(round(rng.uniform(-50, 60), 4)),
+            "longitude": str(round(rng.uniform(-120, 150), 4)),
+            "vargas": rng.choice([None, ["D1", "D9", "D30"], ["D60", "D2"]])
+        })
+    return records
+
+
+def post(url, record):
+    body = kundli_app.app.json.dumps(record).encode()
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req) as response:
+        return response.read()
+
+
+def switch_sid_modes(stop):
+    # Another code path using a different ayanamsa on the server process
+    modes = [swe.SIDM_RAMAN, swe.SIDM_KRISHNAMURTI, swe.SIDM_FAGAN_BRADLEY]
+    while not stop.is_set():
+        for mode in modes:
+            with SWE_LOCK:
+                swe.set_sid_mode(mode)
+                swe.get_ayanamsa(2451545.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    records = random_records(args.requests, args.seed)
+    client = kundli_app.app.test_client()
+    expected = [client.post("/generate_kundli", json=record).get_data() for record in records]
+
+    # Nothing from the serial pass may be served from cache or coalesced
+    kundli_app.chart_cache = TieredCache(LRUCache(len(records)))
+    kundli_app.inflight_charts = SingleFlight()
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, kundli_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/generate_kundli"
+
+    stop = threading.Event()
+    noise = threading.Thread(target=switch_sid_modes, args=(stop,), daemon=True)
+    noise.start()
+
+    order = list(range(len(records)))
+    random.Random(args.seed).shuffle(order)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        bodies = list(pool.map(lambda i: post(url, records[i]), order))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    server.shutdown()
+    kundli_app.executor.shutdown()
+
+    mismatches = sum(1 for i, body in zip(order, bodies) if body != expected[i])
+    executed = kundli_app.inflight_charts.executed
+    print(f"executor={kundli_app.executor.mode} clients={args.clients} "
+          f"requests={args.requests} executed={executed} time={elapsed:.2f}s "
+          f"throughput={args.requests / elapsed:.0f}/s mismatches={mismatches}")
+    assert executed == args.requests, f"only {executed} of {args.requests} requests were computed"
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
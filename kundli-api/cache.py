@@ -0,0 +1,291 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+def chart_cache_key(julian_day, lat, lon, vargas, dasha, ayanamsa, ephemeris, version):
+    """
+    Canonical key for a chart: birth time to the UTC minute, location to ~0.1 m
+    """
+    utc_minute = round((julian_day - 2440587.5) * 1440)
+    return (utc_minute, round(lat, 6), round(lon, 6), tuple(vargas), dasha, ayanamsa, ephemeris, version)
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded least-recently-used cache with hit/miss counters
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+class SQLiteCache:
+    """
+    On-disk cache tier shared by every worker process on a host.
+
+    Values are stored as zlib-compressed JSON in a WAL-mode SQLite file, so
+    readers in other processes are never blocked by a writer. Entries expire
+    after `ttl` seconds and the least recently used are evicted beyond
+    `max_entries`; both are enforced every `prune_every` writes. Hits only note
+    their access time in memory; the times are written in one statement with
+    the next put, or after `touch_every` hits.
+
+    The tier is best-effort: any SQLite error (a lock held past `timeout`
+    seconds, a full disk) is logged and counted, and reads as a miss or skips
+    the write, so the chart is still served.
+    """
+
+    def __init__(self, path, ttl=30 * 24 * 3600, max_entries=1000000, prune_every=500,
+                 touch_every=100, timeout=1.0):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self.touch_every = touch_every
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._writes = 0
+        self._touched = {}
+        self._touches = 0
+        self._touched_lock = threading.Lock()
+        self._local = threading.local()
+        with self._connection() as db:
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS charts ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+                'created REAL NOT NULL, accessed REAL NOT NULL)'
+            )
+            db.execute('CREATE INDEX IF NOT EXISTS charts_accessed ON charts (accessed)')
+
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=self.timeout)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    @staticmethod
+    def _key(key):
+        return json.dumps(key, separators=(',', ':'))
+
+    def _failed(self, action, error):
+        self.errors += 1
+        logger.warning("Chart cache %s failed on %s: %s", action, self.path, error)
+
+    def get(self, key):
+        now = time.time()
+        try:
+            row = self._connection().execute(
+                'SELECT value, created FROM charts WHERE key = ?', (self._key(key),)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._failed('read', e)
+            row = None
+        if row is None or now - row[1] > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self._touched_lock:
+            self._touched[self._key(key)] = now
+            self._touches += 1
+            flush = self._touches >= self.touch_every
+        if flush:
+            self._write(self._flush_touched)
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key, value):
+        now = time.time()
+        blob = zlib.compress(json.dumps(value, separators=(',', ':')).encode())
+
+        def insert(db):
+            db.execute(
+                'INSERT OR REPLACE INTO charts (key, value, created, accessed) VALUES (?, ?, ?, ?)',
+                (self._key(key), blob, now, now)
+            )
+            self._flush_touched(db)
+
+        if self._write(insert):
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                self._write(self._prune)
+
+    def _write(self, statements):
+        """
+        Run statements(db) in one transaction; False (logged) if SQLite fails
+        """
+        try:
+            db = self._connection()
+            with db:
+                statements(db)
+            return True
+        except sqlite3.Error as e:
+            self._failed('write', e)
+            return False
+
+    def _flush_touched(self, db):
+        with self._touched_lock:
+            touched, self._touched = self._touched, {}
+            self._touches = 0
+        db.executemany(
+            'UPDATE charts SET accessed = MAX(accessed, ?) WHERE key = ?',
+            [(accessed, key) for key, accessed in touched.items()]
+        )
+
+    def prune(self):
+        self._write(self._prune)
+
+    def _prune(self, db):
+        self._flush_touched(db)
+        db.execute('DELETE FROM charts WHERE created < ?', (time.time() - self.ttl,))
+        db.execute(
+            'DELETE FROM charts WHERE key IN ('
+            'SELECT key FROM charts ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        db = self._connection()
+        with db:
+            db.execute('DELETE FROM charts')
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        try:
+            size = self._connection().execute('SELECT COUNT(*) FROM charts').fetchone()[0]
+        except sqlite3.Error as e:
+            self._failed('read', e)
+            size = None
+        return {
+            'size': size,
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+class TieredCache:
+    """
+    In-memory LRU in front of an optional on-disk tier; L2 hits are promoted to L1
+    """
+
+    def __init__(self, l1, l2=None):
+        self.l1 = l1
+        self.l2 = l2
+
+    def get(self, key):
+        value = self.l1.get(key)
+        if value is None and self.l2 is not None:
+            value = self.l2.get(key)
+            if value is not None:
+                self.l1.put(key, value)
+        return value
+
+    def put(self, key, value):
+        self.l1.put(key, value)
+        if self.l2 is not None:
+            self.l2.put(key, value)
+
+    def clear(self):
+        self.l1.clear()
+        if self.l2 is not None:
+            self.l2.clear()
+
+    def stats(self):
+        return {
+            'memory': self.l1.stats(),
+            'disk': self.l2.stats() if self.l2 is not None else None
+        }
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one computation.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for and share its result (or exception).
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return call.result()
+
+        try:
+            call.set_result(fn(*args))
+        except Exception as e:
+            call.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+                self.executed += 1
+        return call.result()
+
+    def stats(self):
+        return {
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._calls)
+        }
@@ -0,0 +1,147 @@
+"""
+Compact internal chart: every body's numbers in one NumPy structured array.
+
+A Chart keeps longitudes and speeds as floats and signs, nakshatras,
+dignities and statuses as small integer codes, with the retro and combust flags as bools
+and the divisional chart signs as one int8 matrix. All of it is computed with
+array operations over the bodies (dignity.py, combustion.py, vargas.py).
+Names and the nested dicts of the /generate_kundli `kundli` object are only
+built by to_json(), at the HTTP edge, so a worker process hands back a few
+hundred bytes of arrays instead of a tree of dicts and strings.
+"""
+import numpy as np
+
+from combustion import combust
+from dignity import DIGNITIES, body_indices, dignities, statuses
+from vargas import DEFAULT_VARGAS, calculate_vargas
+from zodiac import BODIES, NAKSHATRA_SPAN, RASHI_ORDER, nakshatras, rashis
+
+# Rows of every chart, in the order the kundli object lists them
+CHART_BODIES = ('Sun', 'Moon', 'Mars', 'Mercury', 'Venus', 'Jupiter', 'Saturn',
+                'Neptune', 'Uranus', 'Pluto', 'Rahu', 'Ketu', 'Ascendant')
+RAHU, KETU, ASCENDANT = (CHART_BODIES.index(body) for body in ('Rahu', 'Ketu', 'Ascendant'))
+GRAHAS = slice(0, ASCENDANT)
+# swisseph ids of the bodies read from the ephemeris (Ketu is derived from Rahu)
+CHART_PLANETS = tuple(BODIES[body] for body in CHART_BODIES[:KETU])
+
+BODY_DTYPE = np.dtype([
+    ('longitude', 'f8'),
+    ('speed', 'f8'),
+    ('sign', 'i1'),
+    ('nakshatra', 'i1'),
+    ('dignity', 'i1'),
+    ('status', 'i1'),
+    ('retro', '?'),
+    ('combust', '?')
+])
+
+_DIGNITY_INDICES = body_indices(CHART_BODIES[GRAHAS])
+_IS_ASCENDANT = np.array(CHART_BODIES) == 'Ascendant'
+
+
+class Chart:
+    """
+    One chart: `bodies` is a BODY_DTYPE row per CHART_BODIES entry and
+    `varga_signs[body, i]` the sign (Aries = 1) in divisional chart `varga_names[i]`
+    """
+    __slots__ = ('julian_day', 'ayanamsa', 'ephemeris', 'swe_calls', 'bodies',
+                 'varga_names', 'varga_signs', 'sunrise', 'sunset', 'dasha')
+
+    def __init__(self, julian_day, ayanamsa, ephemeris, swe_calls, bodies, varga_names, varga_signs):
+        self.julian_day = julian_day
+        self.ayanamsa = ayanamsa
+        self.ephemeris = ephemeris
+        self.swe_calls = swe_calls
+        self.bodies = bodies
+        self.varga_names = varga_names
+        self.varga_signs = varga_signs
+        self.sunrise = None
+        self.sunset = None
+        self.dasha = None
+
+    def to_json(self):
+        """
+        The `kundli` object of /generate_kundli
+        """
+        bodies = self.bodies
+        longitudes = bodies['longitude'].tolist()
+        signs = bodies['sign'].tolist()
+        nakshatra_indices = bodies['nakshatra'].tolist()
+        dignity_codes = bodies['dignity'].tolist()
+        status_codes = bodies['status'].tolist()
+        retro = bodies['retro'].tolist()
+        combust_flags = bodies['combust'].tolist()
+        varga_signs = self.varga_signs.tolist()
+
+        kundli = {}
+        for i, body in enumerate(CHART_BODIES):
+            longitude = longitudes[i]
+            rashi = RASHI_ORDER[signs[i]]
+            nakshatra, nakshatra_lord, _ = nakshatras[nakshatra_indices[i]]
+            if i == ASCENDANT:
+                info = {
+                    'rashi': rashi,
+                    'rashi_lord': rashis[rashi]['lord'],
+                    'degrees': round(longitude % 30, 2),
+                    'total_degrees': round(longitude, 2),
+                    'nakshatra': nakshatra,
+                    'nakshatra_lord': nakshatra_lord
+                }
+            else:
+                info = {
+                    'rashi': rashi,
+                    'rashi_lord': rashis[rashi]['lord'],
+                    'nakshatra': nakshatra,
+                    'nakshatra_lord': nakshatra_lord,
+                    'degrees': round(longitude % 30, 2),
+                    'total_degrees': round(longitude, 2),
+                    'retro': retro[i],
+                    'combust': combust_flags[i],
+                    'status': DIGNITIES[status_codes[i]],
+                    'dignity': DIGNITIES[dignity_codes[i]]
+                }
+            # The house is the sign's number counted from Aries
+            info['house'] = signs[i] + 1
+            info['divisional_charts'] = dict(zip(self.varga_names, varga_signs[i]))
+            kundli[body] = info
+        return kundli
+
+
+def build_chart(context, vargas=DEFAULT_VARGAS):
+    """
+    A Chart from a chart_context.ChartContext, in one pass of array operations
+    """
+    bodies = np.zeros(len(CHART_BODIES), dtype=BODY_DTYPE)
+    ascendant = context.ascendant
+    for i, planet_num in enumerate(CHART_PLANETS):
+        bodies[i]['longitude'], bodies[i]['speed'] = context.body(planet_num)
+    # Ketu is opposite Rahu as reported (to two decimals)
+    bodies[KETU]['longitude'] = (round(float(bodies[RAHU]['longitude']), 2) + 180) % 360
+    bodies[KETU]['speed'] = bodies[RAHU]['speed']
+    bodies[ASCENDANT]['longitude'] = ascendant
+
+    longitudes = bodies['longitude']
+    bodies['sign'] = (longitudes / 30).astype(np.int64)
+    bodies['nakshatra'] = (longitudes / NAKSHATRA_SPAN).astype(np.int64)
+
+    grahas = bodies[GRAHAS]
+    sun_longitude = grahas['longitude'][0]
+    grahas['retro'] = grahas['speed'] < 0
+    grahas['retro'][[RAHU, KETU]] = True
+    grahas['combust'] = combust(_DIGNITY_INDICES, grahas['longitude'], grahas['speed'], sun_longitude)
+    grahas['dignity'] = dignities(_DIGNITY_INDICES, grahas['longitude'])
+    grahas['status'] = statuses(_DIGNITY_INDICES, grahas['longitude'])
+
+    # Divisional charts of the planets and Rahu come from their reported (rounded)
+    # longitudes, as the kundli has always given them; Ketu and the lagna are exact
+    varga_longitudes = longitudes.copy()
+    varga_longitudes[:KETU] = [round(longitude, 2) for longitude in longitudes[:KETU].tolist()]
+    charts = calculate_vargas(varga_longitudes, CHART_BODIES, _IS_ASCENDANT, vargas)
+    varga_names = tuple(charts)
+    varga_signs = np.empty((len(CHART_BODIES), len(varga_names)), dtype=np.int8)
+    for j, signs in enumerate(charts.values()):
+        varga_signs[:, j] = signs
+
+    ephemeris = context.backend.name if context.backend is not None else 'swisseph'
+    return Chart(context.julian_day, context.ayanamsa, ephemeris, context.swe_calls,
+                 bodies, varga_names, varga_signs)
@@ -0,0 +1,104 @@
+import swisseph as swe
+
+
+class ChartContext:
+    """
+    Everything one chart needs from swisseph, computed lazily and at most once.
+
+    Body positions come from `backend` (an ephemeris.EphemerisBackend) when one
+    is given and covers the body and date, otherwise from swisseph directly so
+    they share the chart's ayanamsa. `swe_calls` counts the swisseph calls made
+    on behalf of this chart, including the rise_trans calls for its sunrise and
+    sunset when riseset.rise_set has to compute them rather than hit its cache.
+    """
+
+    def __init__(self, julian_day, lat, lon, backend=None):
+        self.julian_day = julian_day
+        self.lat = lat
+        self.lon = lon
+        self.backend = backend
+        self.swe_calls = 0
+        self._ayanamsa = None
+        self._houses = None
+        self._bodies = {}
+
+    @property
+    def ayanamsa(self):
+        if self._ayanamsa is None:
+            swe.set_sid_mode(swe.SIDM_LAHIRI)
+            self._ayanamsa = swe.get_ayanamsa(self.julian_day)
+            self.swe_calls += 2
+        return self._ayanamsa
+
+    def _calculate_houses(self):
+        flags = swe.FLG_SWIEPH
+        hsys = b'W'  # Whole Sign system
+        cusps, asc_mc = swe.houses_ex(self.julian_day, self.lat, self.lon, hsys, flags)
+        self.swe_calls += 1
+
+        ayanamsa = self.ayanamsa
+        self._houses = (
+            [(h - ayanamsa) % 360 for h in cusps],
+            (asc_mc[0] - ayanamsa) % 360
+        )
+
+    @property
+    def houses(self):
+        """
+        Sidereal house cusps
+        """
+        if self._houses is None:
+            self._calculate_houses()
+        return self._houses[0]
+
+    @property
+    def ascendant(self):
+        """
+        Sidereal longitude of the lagna
+        """
+        if self._houses is None:
+            self._calculate_houses()
+        return self._houses[1]
+
+    def body(self, planet_num):
+        """
+        Sidereal (longitude, speed) of a swisseph body
+        """
+        if planet_num in self._bodies:
+            return self._bodies[planet_num]
+
+        if (self.backend is not None and self.backend.name != 'swisseph'
+                and self.backend.covers(planet_num, self.julian_day)):
+            position = self.backend.position(planet_num, self.julian_day)
+        else:
+            flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+            planet_info = swe.calc_ut(self.julian_day, planet_num, flags)
+            self.swe_calls += 1
+            longitude = (planet_info[0][0] - self.ayanamsa) % 360
+            position = (longitude, planet_info[0][3])
+        self._bodies[planet_num] = position
+        return position
+
+
+def prefetch_bodies(contexts, planet_nums):
+    """
+    Fill in the body positions of many contexts with one `positions` call per
+    body and backend, for the dates each backend covers. swisseph contexts are
+    left to compute their own, since swisseph has no vectorized call.
+    """
+    groups = {}
+    for context in contexts:
+        if context.backend is not None and context.backend.name != 'swisseph':
+            groups.setdefault(context.backend.name, []).append(context)
+    for group in groups.values():
+        backend = group[0].backend
+        for planet_num in planet_nums:
+            covered = [
+                context for context in group
+                if planet_num not in context._bodies and backend.covers(planet_num, context.julian_day)
+            ]
+            if not covered:
+                continue
+            longitudes, speeds = backend.positions(planet_num, [context.julian_day for context in covered])
+            for context, longitude, speed in zip(covered, longitudes.tolist(), speeds.tolist()):
+                context._bodies[planet_num] = (longitude, speed)
@@ -0,0 +1,95 @@
+"""
+Combustion (asta): a planet within its orb of the Sun.
+
+The separation is the true angular distance between the two longitudes, so
+combustion across a sign boundary counts, and each planet has its classical
+orb, narrower for Mercury and Venus while retrograde. The Sun, the outer
+planets and the nodes are never combust.
+
+`combust` works on whole arrays of bodies; `find_combustions` finds the windows
+in which a planet is combust over a range of dates, by sampling it like the
+ingress search and bisecting every change of state together
+(events.find_changes).
+"""
+import numpy as np
+
+from dignity import BODY_INDEX, DIGNITY_BODIES
+from ephemeris import get_backend
+from events import COARSE_STEPS, DEFAULT_COARSE_STEP, find_changes
+from transits import format_ist
+from zodiac import BODIES
+
+# Orb in degrees: (direct, retrograde)
+COMBUSTION_ORBS = {
+    'Moon': (12, 12),
+    'Mars': (17, 17),
+    'Mercury': (14, 12),
+    'Jupiter': (11, 11),
+    'Venus': (10, 8),
+    'Saturn': (15, 15)
+}
+COMBUSTION_BODIES = tuple(COMBUSTION_ORBS)
+
+# Orbs per DIGNITY_BODIES index; 0 for bodies that are never combust
+DIRECT_ORBS = np.array([COMBUSTION_ORBS.get(body, (0, 0))[0] for body in DIGNITY_BODIES], dtype=np.float64)
+RETROGRADE_ORBS = np.array([COMBUSTION_ORBS.get(body, (0, 0))[1] for body in DIGNITY_BODIES], dtype=np.float64)
+
+# Halvings of a coarse step: 2**-20 day is under 0.1 s
+BISECTIONS = 20
+
+
+def separations(longitudes, sun_longitudes):
+    """
+    Angular distance from the Sun in degrees, 0 to 180
+    """
+    return np.abs((np.asarray(longitudes) - np.asarray(sun_longitudes) + 180) % 360 - 180)
+
+
+def combust(bodies, longitudes, speeds, sun_longitudes):
+    """
+    Combustion for arrays of DIGNITY_BODIES indices, longitudes, speeds and Sun longitudes
+    """
+    bodies = np.asarray(bodies)
+    orbs = np.where(np.asarray(speeds) < 0, RETROGRADE_ORBS[bodies], DIRECT_ORBS[bodies])
+    return separations(longitudes, sun_longitudes) < orbs
+
+
+def is_combust(body, longitude, speed, sun_longitude):
+    """
+    Combustion of one body (by name)
+    """
+    return bool(combust(BODY_INDEX[body], longitude, speed, sun_longitude))
+
+
+def find_combustions(body, start, end, ephemeris=None):
+    """
+    Windows in which `body` is combust between `start` and `end`, sorted by time.
+
+    A window already running at `start` has a start of None, and one still
+    running at `end` an end of None.
+    """
+    backend = get_backend(ephemeris)
+    index = BODY_INDEX[body]
+
+    def state(julian_days):
+        longitudes, speeds = backend.positions(BODIES[body], julian_days)
+        sun, _ = backend.positions(BODIES['Sun'], julian_days)
+        return combust(index, longitudes, speeds, sun)
+
+    julian_days = np.append(np.arange(start, end, COARSE_STEPS.get(body, DEFAULT_COARSE_STEP)), end)
+    times, before, combust_at_start = find_changes(state, julian_days, BISECTIONS)
+    labels = format_ist(times)
+
+    windows = []
+    window = {'body': body, 'start': None, 'start_time': None} if combust_at_start else None
+    for julian_day, time, entering in zip(times.tolist(), labels, ~before):
+        if entering:
+            window = {'body': body, 'start': julian_day, 'start_time': time}
+        elif window is not None:
+            window.update(end=julian_day, end_time=time)
+            windows.append(window)
+            window = None
+    if window is not None:
+        window.update(end=None, end_time=None)
+        windows.append(window)
+    return windows
@@ -0,0 +1,273 @@
+"""
+Dasha systems as small tables driving one shared period engine.
+
+A system lists its lords in sequence with their years, how the first
+mahadasha and its balance follow from the chart, and how a period divides into
+sub-periods. The engine keeps every level as a compact array of (start, end,
+lord) rows, Julian days (UT) and an index into the system's lords, with the
+children of each period stored contiguously. Levels are only subdivided when
+asked for, and the period running at a given time is found by binary search
+one level at a time without expanding anything else.
+"""
+import numpy as np
+
+from transits import format_ist, parse_ist
+from zodiac import BODIES, NAKSHATRA_SPAN, RASHI_ORDER, rashis
+
+# Length of a dasha year in days
+DASHA_YEAR_DAYS = 365.25
+
+DASHA_LEVELS = ('mahadasha', 'antardasha', 'pratyantardasha')
+
+PERIOD_DTYPE = np.dtype([('start', 'f8'), ('end', 'f8'), ('lord', 'i2')])
+
+# Signs whose dasha counts run forwards through the zodiac (the rest run backwards)
+SAVYA_SIGNS = frozenset(['Aries', 'Taurus', 'Gemini', 'Libra', 'Scorpio', 'Sagittarius'])
+
+
+class DashaSystem:
+    """
+    A nakshatra dasha: lords in sequence with their years.
+
+    `nakshatra_lords[n]` is the first mahadasha lord for a Moon in nakshatra n
+    and `nakshatra_groups[n]` is (position, size) of n within the run of
+    nakshatras that lord rules; the balance of the first mahadasha is what is
+    left of that run. Sub-periods go through every lord starting `sub_offset`
+    steps after the parent's own lord, in `sub_directions` (+1 or -1 per lord),
+    each taking a share of the parent equal to its years (or an equal share).
+    """
+
+    def __init__(self, name, lords, years, cycles=1, nakshatra_lords=None, nakshatra_groups=None,
+                 sub_offset=0, sub_directions=None, equal_sub_periods=False):
+        self.name = name
+        self.lords = tuple(lords)
+        self.years = np.array(years, dtype=np.float64)
+        self.cycles = cycles
+        self.nakshatra_lords = nakshatra_lords
+        self.nakshatra_groups = nakshatra_groups
+
+        count = len(self.lords)
+        directions = np.ones(count, dtype=np.int64) if sub_directions is None else np.array(sub_directions)
+        steps = sub_offset + np.arange(count)
+        # sub_order[lord] = lords of the sub-periods; sub_bounds[lord] = their edges as
+        # fractions of the parent period
+        self.sub_order = (np.arange(count)[:, None] + directions[:, None] * steps) % count
+        weights = np.ones((count, count)) if equal_sub_periods else self.years[self.sub_order]
+        shares = np.cumsum(weights, axis=1) / weights.sum(axis=1, keepdims=True)
+        self.sub_bounds = np.hstack([np.zeros((count, 1)), shares])
+
+    def mahadasha_years(self, context):
+        """
+        (first lord, years of each mahadasha, years of the first already elapsed at birth)
+        """
+        moon_longitude, _ = context.body(BODIES['Moon'])
+        nakshatra = int(moon_longitude / NAKSHATRA_SPAN)
+        first = self.nakshatra_lords[nakshatra]
+        position, size = self.nakshatra_groups[nakshatra]
+        elapsed = (position + (moon_longitude % NAKSHATRA_SPAN) / NAKSHATRA_SPAN) / size
+
+        order = (first + np.arange(len(self.lords) * self.cycles)) % len(self.lords)
+        return order, self.years[order], elapsed * self.years[first]
+
+    def dasha(self, context):
+        """
+        The mahadashas of a chart (a chart_context.ChartContext) as a Dasha
+        """
+        order, years, elapsed = self.mahadasha_years(context)
+        keep = years > 0
+        order, years = order[keep], years[keep]
+        edges = context.julian_day + (np.concatenate([[0], np.cumsum(years)]) - elapsed) * DASHA_YEAR_DAYS
+
+        mahadashas = np.empty(len(order), dtype=PERIOD_DTYPE)
+        mahadashas['start'] = edges[:-1]
+        mahadashas['end'] = edges[1:]
+        mahadashas['lord'] = order
+        return Dasha(self, mahadashas)
+
+
+class CharaDashaSystem(DashaSystem):
+    """
+    Jaimini chara dasha: sign periods from the lagna, their years from the chart.
+
+    The sequence runs forwards from the lagna sign when the 9th sign from it is
+    savya, otherwise backwards. A sign's years are the count from it to its
+    lord's sign (forwards for savya signs, backwards otherwise) less one, 12 when
+    that is zero, and 12 minus that in the second cycle. Scorpio and Aquarius
+    use Mars and Saturn. Antardashas are twelve equal periods starting from the
+    next sign in the mahadasha sign's own direction.
+    """
+
+    def __init__(self):
+        directions = [1 if sign in SAVYA_SIGNS else -1 for sign in RASHI_ORDER]
+        super().__init__('Chara', RASHI_ORDER, np.zeros(12), cycles=2, sub_offset=1,
+                         sub_directions=directions, equal_sub_periods=True)
+
+    def mahadasha_years(self, context):
+        lagna = int(context.ascendant / 30)
+        direction = 1 if RASHI_ORDER[(lagna + 8) % 12] in SAVYA_SIGNS else -1
+        order = (lagna + direction * np.arange(12)) % 12
+
+        years = np.empty(12)
+        for i, sign in enumerate(order):
+            name = RASHI_ORDER[sign]
+            lord_longitude, _ = context.body(BODIES[rashis[name]['lord']])
+            lord_sign = int(lord_longitude / 30)
+            distance = (lord_sign - sign) % 12 if name in SAVYA_SIGNS else (sign - lord_sign) % 12
+            years[i] = distance or 12
+        return np.tile(order, 2), np.concatenate([years, 12 - years]), 0.0
+
+
+class Dasha:
+    """
+    Periods of one system for one chart; level 0 is the mahadashas
+    """
+
+    def __init__(self, system, mahadashas):
+        self.system = system
+        self.levels = [mahadashas]
+
+    def subdivide(self, periods):
+        """
+        The sub-periods of every period in `periods`, each parent's children contiguous
+        """
+        system = self.system
+        edges = (periods['start'][:, None]
+                 + (periods['end'] - periods['start'])[:, None] * system.sub_bounds[periods['lord']])
+        children = np.empty((len(periods), len(system.lords)), dtype=PERIOD_DTYPE)
+        children['start'] = edges[:, :-1]
+        children['end'] = edges[:, 1:]
+        children['lord'] = system.sub_order[periods['lord']]
+        return children.ravel()
+
+    def level(self, depth):
+        """
+        Every period at `depth` (0 = mahadashas), subdividing on first use
+        """
+        while len(self.levels) <= depth:
+            self.levels.append(self.subdivide(self.levels[-1]))
+        return self.levels[depth]
+
+    def active(self, julian_day, depth=len(DASHA_LEVELS)):
+        """
+        The period running at `julian_day` on each level down to `depth`
+        """
+        found = []
+        periods = self.levels[0]
+        for _ in range(depth):
+            i = np.searchsorted(periods['end'], julian_day, side='right')
+            if i == len(periods) or periods['start'][i] > julian_day:
+                break
+            found.append(periods[i])
+            periods = self.subdivide(periods[i:i + 1])
+        return found
+
+    def describe(self, periods):
+        """
+        JSON-ready dicts for an array of periods
+        """
+        starts = format_ist(periods['start'])
+        ends = format_ist(periods['end'])
+        return [
+            {
+                'lord': self.system.lords[lord],
+                'start': float(start),
+                'end': float(end),
+                'start_time': start_time,
+                'end_time': end_time
+            }
+            for start, end, lord, start_time, end_time in zip(
+                periods['start'], periods['end'], periods['lord'], starts, ends
+            )
+        ]
+
+    def timeline(self, depth):
+        """
+        Nested periods, `depth` levels deep (1 = mahadashas only)
+        """
+        levels = [self.describe(self.level(level)) for level in range(depth)]
+        width = len(self.system.lords)
+        for level in range(depth - 1, 0, -1):
+            key = f'{DASHA_LEVELS[level]}s'
+            for i, parent in enumerate(levels[level - 1]):
+                parent[key] = levels[level][i * width:(i + 1) * width]
+        return levels[0]
+
+
+def _nakshatra_runs(first_nakshatra, sizes):
+    # Lord index and (position, size) for each nakshatra, from runs of `sizes`
+    # nakshatras ruled by consecutive lords starting at `first_nakshatra`
+    lords, groups = [0] * 27, [None] * 27
+    nakshatra = first_nakshatra
+    for lord, size in enumerate(sizes):
+        for position in range(size):
+            lords[nakshatra % 27] = lord
+            groups[nakshatra % 27] = (position, size)
+            nakshatra += 1
+    return lords, groups
+
+
+# Ashtottari: runs of 4, 3, 4, 3, 3, 3, 4, 3 nakshatras from Ardra (Abhijit not counted)
+ASHTOTTARI_NAKSHATRA_LORDS, ASHTOTTARI_NAKSHATRA_GROUPS = _nakshatra_runs(5, (4, 3, 4, 3, 3, 3, 4, 3))
+
+DASHA_SYSTEMS = {
+    'vimshottari': DashaSystem(
+        'Vimshottari',
+        ('Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury'),
+        (7, 20, 6, 10, 7, 18, 16, 19, 17),
+        # The nakshatra lords repeat this sequence from Ashwini
+        nakshatra_lords=[n % 9 for n in range(27)],
+        nakshatra_groups=[(0, 1)] * 27
+    ),
+    'yogini': DashaSystem(
+        'Yogini',
+        ('Mangala', 'Pingala', 'Dhanya', 'Bhramari', 'Bhadrika', 'Ulka', 'Siddha', 'Sankata'),
+        (1, 2, 3, 4, 5, 6, 7, 8),
+        cycles=3,
+        # Nakshatra number + 3, remainder by 8, counts from Mangala
+        nakshatra_lords=[(n + 3) % 8 for n in range(27)],
+        nakshatra_groups=[(0, 1)] * 27
+    ),
+    'ashtottari': DashaSystem(
+        'Ashtottari',
+        ('Sun', 'Moon', 'Mars', 'Mercury', 'Saturn', 'Jupiter', 'Rahu', 'Venus'),
+        (6, 15, 8, 17, 10, 19, 12, 21),
+        nakshatra_lords=ASHTOTTARI_NAKSHATRA_LORDS,
+        nakshatra_groups=ASHTOTTARI_NAKSHATRA_GROUPS
+    ),
+    'chara': CharaDashaSystem()
+}
+
+
+def parse_dasha(value):
+    """
+    Read the `dasha` request field into (system, depth, at) or None.
+
+    Accepts true (Vimshottari, two levels), a depth from 0 (none) to 3, or
+    {"system": ..., "depth": ..., "at": "YYYY-MM-DD HH:MM"}; `at` asks for the
+    periods running at that IST time.
+    """
+    if value is None or value is False or value == 0:
+        return None
+    if not isinstance(value, dict):
+        value = {} if value is True else {'depth': value}
+
+    system = str(value.get('system', 'vimshottari')).lower()
+    if system not in DASHA_SYSTEMS:
+        raise ValueError(f"Unsupported dasha system: {system}")
+    depth = int(value.get('depth', 2))
+    if not 1 <= depth <= len(DASHA_LEVELS):
+        raise ValueError(f"Dasha depth must be between 1 and {len(DASHA_LEVELS)}")
+    at = parse_ist(value['at']) if value.get('at') else None
+    return system, depth, at
+
+
+def dasha_response(context, system, depth, at=None):
+    dasha = DASHA_SYSTEMS[system].dasha(context)
+    response = {
+        'system': dasha.system.name,
+        'periods': dasha.timeline(depth)
+    }
+    if at is not None:
+        active = dasha.active(at)
+        response['active'] = dasha.describe(np.array(active, dtype=PERIOD_DTYPE))
+    return response
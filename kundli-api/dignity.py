@@ -0,0 +1,150 @@
+"""
+Planetary dignity from precomputed body x sign tables.
+
+SIGN_DIGNITY[body, sign] holds the dignity a body has anywhere in a sign:
+exalted or debilitated, else own sign, else its natural relationship (friend,
+neutral, enemy) with the sign's lord. `dignities` refines it by degree: the
+Moon is exalted only to Taurus 3 and Mercury only to Virgo 15, beyond which
+they have the sign's ordinary dignity, and moolatrikona, a degree range within
+one sign per body, takes precedence over own sign and exaltation there. Looking
+up any (body, longitude) is a few array reads, done for whole arrays of bodies
+and longitudes at once, e.g. every body of every chart in a batch.
+
+Chart `status` stays whole-sign, as it has always been reported, and comes from
+`statuses`: the Sun has no debilitation sign and Neptune, Uranus and Pluto
+keep their usual modern signs. The outer planets and the nodes have no own
+signs or natural relationships.
+"""
+import numpy as np
+
+from zodiac import NATURAL_ENEMIES, NATURAL_FRIENDS, RASHI_ORDER, rashis
+
+DIGNITY_BODIES = ('Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn',
+                  'Neptune', 'Uranus', 'Pluto', 'Rahu', 'Ketu')
+BODY_INDEX = {body: i for i, body in enumerate(DIGNITY_BODIES)}
+
+# Dignities from weakest to strongest; codes are indices into this
+DIGNITIES = ('Debilitated', 'Enemy', 'Neutral', 'Friend', 'Own', 'Moolatrikona', 'Exalted')
+DEBILITATED, ENEMY, NEUTRAL, FRIEND, OWN, MOOLATRIKONA, EXALTED = range(len(DIGNITIES))
+
+# Natural relationships: enemy 0, neutral 1, friend 2
+RELATIONSHIP_ENEMY, RELATIONSHIP_NEUTRAL, RELATIONSHIP_FRIEND = range(3)
+
+EXALTATION_SIGNS = {
+    'Sun': 'Aries', 'Moon': 'Taurus', 'Mars': 'Capricorn', 'Mercury': 'Virgo',
+    'Jupiter': 'Cancer', 'Venus': 'Pisces', 'Saturn': 'Libra',
+    'Neptune': 'Pisces', 'Uranus': 'Aquarius', 'Pluto': 'Scorpio'
+}
+DEBILITATION_SIGNS = {
+    'Moon': 'Scorpio', 'Mars': 'Cancer', 'Mercury': 'Pisces',
+    'Jupiter': 'Capricorn', 'Venus': 'Virgo', 'Saturn': 'Aries',
+    'Neptune': 'Virgo', 'Uranus': 'Leo', 'Pluto': 'Taurus'
+}
+# Exaltation ends at this degree of the exaltation sign where it shares the
+# sign with moolatrikona or own sign; the rest are whole-sign
+EXALTATION_TO_DEGREES = {'Moon': 3, 'Mercury': 15}
+# (sign, from degree, to degree)
+MOOLATRIKONA_RANGES = {
+    'Sun': ('Leo', 0, 20), 'Moon': ('Taurus', 3, 30), 'Mars': ('Aries', 0, 12),
+    'Mercury': ('Virgo', 15, 20), 'Jupiter': ('Sagittarius', 0, 10),
+    'Venus': ('Libra', 0, 15), 'Saturn': ('Aquarius', 0, 20)
+}
+
+
+def _relationship_table():
+    table = np.full((len(DIGNITY_BODIES),) * 2, RELATIONSHIP_NEUTRAL, dtype=np.int8)
+    for planet, friends in NATURAL_FRIENDS.items():
+        for other in friends:
+            table[BODY_INDEX[planet], BODY_INDEX[other]] = RELATIONSHIP_FRIEND
+        for other in NATURAL_ENEMIES[planet]:
+            table[BODY_INDEX[planet], BODY_INDEX[other]] = RELATIONSHIP_ENEMY
+    return table
+
+
+# NATURAL_RELATIONSHIPS[body, other]: how `body` regards `other`
+NATURAL_RELATIONSHIPS = _relationship_table()
+
+
+def _lordship_table():
+    table = np.full((len(DIGNITY_BODIES), 12), NEUTRAL, dtype=np.int8)
+    for sign, name in enumerate(RASHI_ORDER):
+        lord = rashis[name]['lord']
+        for planet in NATURAL_FRIENDS:
+            if planet == lord:
+                table[BODY_INDEX[planet], sign] = OWN
+            else:
+                relationship = NATURAL_RELATIONSHIPS[BODY_INDEX[planet], BODY_INDEX[lord]]
+                table[BODY_INDEX[planet], sign] = (ENEMY, NEUTRAL, FRIEND)[relationship]
+    return table
+
+
+def _sign_dignity_table():
+    table = LORDSHIP_DIGNITY.copy()
+    for planet, sign in EXALTATION_SIGNS.items():
+        table[BODY_INDEX[planet], RASHI_ORDER.index(sign)] = EXALTED
+    for planet, sign in DEBILITATION_SIGNS.items():
+        table[BODY_INDEX[planet], RASHI_ORDER.index(sign)] = DEBILITATED
+    return table
+
+
+# Dignity from the sign's lord alone, and with exaltation and debilitation
+LORDSHIP_DIGNITY = _lordship_table()
+SIGN_DIGNITY = _sign_dignity_table()
+
+# Per body: the degree exaltation ends at (30 for the whole sign)
+EXALTATION_TO = np.array([EXALTATION_TO_DEGREES.get(body, 30) for body in DIGNITY_BODIES], dtype=np.float64)
+
+
+def _moolatrikona_tables():
+    signs = np.full(len(DIGNITY_BODIES), -1, dtype=np.int64)
+    starts = np.zeros(len(DIGNITY_BODIES))
+    ends = np.zeros(len(DIGNITY_BODIES))
+    for planet, (sign, start, end) in MOOLATRIKONA_RANGES.items():
+        signs[BODY_INDEX[planet]] = RASHI_ORDER.index(sign)
+        starts[BODY_INDEX[planet]] = start
+        ends[BODY_INDEX[planet]] = end
+    return signs, starts, ends
+
+
+# Per body: moolatrikona sign (-1 for none) and degree range
+MOOLATRIKONA_SIGNS, MOOLATRIKONA_FROM, MOOLATRIKONA_TO = _moolatrikona_tables()
+
+
+def body_indices(bodies):
+    """
+    DIGNITY_BODIES indices for an array of body names
+    """
+    return np.array([BODY_INDEX[body] for body in np.ravel(bodies)]).reshape(np.shape(bodies))
+
+
+def dignities(bodies, longitudes):
+    """
+    Dignity codes for arrays of body indices and sidereal longitudes (broadcast together)
+    """
+    bodies = np.asarray(bodies)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    signs = (longitudes // 30).astype(np.int64) % 12
+    degrees = longitudes - 30 * (longitudes // 30)
+    codes = SIGN_DIGNITY[bodies, signs]
+    past_exaltation = (codes == EXALTED) & (degrees >= EXALTATION_TO[bodies])
+    codes = np.where(past_exaltation, LORDSHIP_DIGNITY[bodies, signs], codes)
+    moolatrikona = ((signs == MOOLATRIKONA_SIGNS[bodies])
+                    & (degrees >= MOOLATRIKONA_FROM[bodies]) & (degrees < MOOLATRIKONA_TO[bodies]))
+    return np.where(moolatrikona, MOOLATRIKONA, codes)
+
+
+def statuses(bodies, longitudes):
+    """
+    Whole-sign status codes (EXALTED, DEBILITATED or NEUTRAL) for arrays of body
+    indices and sidereal longitudes, as chart `status` reports them
+    """
+    signs = (np.asarray(longitudes, dtype=np.float64) // 30).astype(np.int64) % 12
+    codes = SIGN_DIGNITY[np.asarray(bodies), signs]
+    return np.where((codes == EXALTED) | (codes == DEBILITATED), codes, NEUTRAL)
+
+
+def body_dignity(body, longitude):
+    """
+    Dignity name of one body (by name) at one longitude
+    """
+    return DIGNITIES[int(dignities(BODY_INDEX[body], longitude))]
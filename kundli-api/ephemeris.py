@@ -0,0 +1,190 @@
+"""
+Interchangeable sources of sidereal (Lahiri) body positions.
+
+Every backend answers `positions(planet_num, julian_days)` for a whole array of
+UT Julian days at once and returns (longitudes, speeds) arrays in the same
+convention as the kundli (chart_context.ChartContext): tropical longitude minus
+swisseph's Lahiri ayanamsa, mod 360, and the tropical longitude speed in degrees
+per day. Bodies are named by their swisseph ids.
+
+    swisseph   swe.calc_ut, one call per date (the reference)
+    chebyshev  the precomputed grid in ephemeris_grid.py
+    skyfield   JPL DE421 through skyfield, one vectorized call per body
+
+A deployment picks its default with KUNDLI_EPHEMERIS; /generate_kundli also
+accepts an "ephemeris" field naming one of the above for that request.
+"""
+import os
+import threading
+
+import numpy as np
+import swisseph as swe
+
+import resources
+from tables import TABLE_DIR
+
+DEFAULT_EPHEMERIS = os.environ.get('KUNDLI_EPHEMERIS', 'swisseph')
+
+
+def swisseph_positions(planet_num, julian_days, flags=swe.FLG_SWIEPH | swe.FLG_SPEED):
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    julian_days = np.asarray(julian_days, dtype=np.float64).ravel()
+    longitudes = np.empty(len(julian_days))
+    speeds = np.empty(len(julian_days))
+    for i, jd in enumerate(julian_days):
+        planet_info = swe.calc_ut(jd, planet_num, flags)
+        longitudes[i] = (planet_info[0][0] - swe.get_ayanamsa(jd)) % 360
+        speeds[i] = planet_info[0][3]
+    return longitudes, speeds
+
+
+def lahiri_ayanamsa(julian_days):
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    return np.array([swe.get_ayanamsa(jd) for jd in np.ravel(julian_days)])
+
+
+class EphemerisBackend:
+    """
+    Base class: subclasses implement `positions` and, when limited, `covers`
+    """
+    name = None
+
+    def covers(self, planet_num, julian_day):
+        return True
+
+    def positions(self, planet_num, julian_days):
+        """
+        Sidereal (longitudes, speeds) arrays for an array of UT Julian days
+        """
+        raise NotImplementedError
+
+    def position(self, planet_num, julian_day):
+        longitudes, speeds = self.positions(planet_num, [julian_day])
+        return float(longitudes[0]), float(speeds[0])
+
+
+class SwissephBackend(EphemerisBackend):
+    name = 'swisseph'
+
+    def positions(self, planet_num, julian_days):
+        return swisseph_positions(planet_num, julian_days)
+
+
+class ChebyshevBackend(EphemerisBackend):
+    name = 'chebyshev'
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def covers(self, planet_num, julian_day):
+        return self.grid.covers(planet_num, julian_day)
+
+    def positions(self, planet_num, julian_days):
+        return self.grid.positions(planet_num, julian_days)
+
+
+# swisseph id -> kernel target. Planets from Mars outwards use their system
+# barycenters, which every JPL kernel carries and which sit within metres of Mars
+# and far below an arc-second from the outer planets.
+SKYFIELD_TARGETS = {
+    swe.SUN: 'sun',
+    swe.MOON: 'moon',
+    swe.MERCURY: 'mercury',
+    swe.VENUS: 'venus',
+    swe.MARS: 'mars barycenter',
+    swe.JUPITER: 'jupiter barycenter',
+    swe.SATURN: 'saturn barycenter',
+    swe.URANUS: 'uranus barycenter',
+    swe.NEPTUNE: 'neptune barycenter',
+    swe.PLUTO: 'pluto barycenter'
+}
+
+# Half-width of the central difference used for speeds (one hour)
+SPEED_STEP = 1 / 24
+
+
+class SkyfieldBackend(EphemerisBackend):
+    """
+    Apparent geocentric positions in the true ecliptic of date from a JPL kernel.
+
+    All dates for a body go through skyfield as one array-valued Time, together
+    with the points an hour either side that give the speed. The mean node is
+    not in the kernel and comes from swisseph.
+    """
+    name = 'skyfield'
+
+    def __init__(self, kernel_name='de421.bsp'):
+        from skyfield.api import load
+
+        self.kernel = resources.skyfield_kernel(kernel_name)
+        self.timescale = load.timescale()
+        self.earth = self.kernel['earth']
+        # Span covered by every center -> target pair in the kernel, less a day
+        # at both ends for the speed step
+        spans = {}
+        for segment in self.kernel.segments:
+            key = (segment.center, segment.target)
+            start, end = spans.get(key, (np.inf, -np.inf))
+            spans[key] = (min(start, segment.spk_segment.start_jd), max(end, segment.spk_segment.end_jd))
+        self.start = max(start for start, _ in spans.values()) + 1
+        self.end = min(end for _, end in spans.values()) - 1
+
+    def covers(self, planet_num, julian_day):
+        return planet_num in SKYFIELD_TARGETS and self.start <= julian_day < self.end
+
+    def positions(self, planet_num, julian_days):
+        from skyfield.framelib import ecliptic_frame
+
+        if planet_num not in SKYFIELD_TARGETS:
+            return swisseph_positions(planet_num, julian_days)
+        julian_days = np.asarray(julian_days, dtype=np.float64).ravel()
+        if np.any(julian_days < self.start) or np.any(julian_days >= self.end):
+            raise ValueError("Date outside the range of the skyfield ephemeris")
+
+        times = self.timescale.ut1_jd(np.concatenate([
+            julian_days, julian_days - SPEED_STEP, julian_days + SPEED_STEP
+        ]))
+        apparent = self.earth.at(times).observe(self.kernel[SKYFIELD_TARGETS[planet_num]]).apparent()
+        _, longitude, _ = apparent.frame_latlon(ecliptic_frame)
+        tropical, before, after = longitude.degrees.reshape(3, -1)
+
+        speeds = ((after - before + 180) % 360 - 180) / (2 * SPEED_STEP)
+        return (tropical - lahiri_ayanamsa(julian_days)) % 360, speeds
+
+
+def _chebyshev_backend():
+    from ephemeris_grid import EphemerisGrid
+
+    path = os.environ.get('KUNDLI_EPHEMERIS_GRID') or os.path.join(TABLE_DIR or '', 'ephemeris_grid')
+    return ChebyshevBackend(EphemerisGrid.load(path))
+
+
+BACKENDS = {
+    'swisseph': SwissephBackend,
+    'chebyshev': _chebyshev_backend,
+    'skyfield': SkyfieldBackend
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def parse_ephemeris(value):
+    """
+    Validate the `ephemeris` request field, falling back to DEFAULT_EPHEMERIS
+    """
+    name = DEFAULT_EPHEMERIS if value is None else str(value).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unsupported ephemeris: {name}")
+    return name
+
+
+def get_backend(name=None):
+    """
+    The named backend (default: KUNDLI_EPHEMERIS), created once per process
+    """
+    name = parse_ephemeris(name)
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = BACKENDS[name]()
+        return _backends[name]
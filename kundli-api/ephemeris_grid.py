@@ -0,0 +1,256 @@
+"""
+Precomputed sidereal ephemeris over 1900-2100, evaluated by Chebyshev polynomials.
+
+For every body, the span is cut into fixed-length segments and the sidereal
+(Lahiri) longitude and the longitude speed on each segment are fitted with a
+Chebyshev series sampled at Chebyshev nodes. A position query is then one
+segment lookup and a short polynomial evaluation instead of a swisseph call,
+and whole arrays of dates are answered at once.
+
+Longitudes follow the kundli (chart_context.ChartContext) exactly:
+(calc_ut tropical longitude - get_ayanamsa) % 360, with calc_ut's speed.
+
+The one term a smooth fit cannot follow is the gravitational deflection of
+light by the Sun, which swisseph applies to the planets: it grows to several
+arc-seconds in the hours a planet spends within a fraction of a degree of the
+Sun. The grid is therefore fitted without it (FLG_NOGDEFL), and any date on
+which a planet is within DEFLECTION_ORB of the Sun goes back to swisseph, from
+`covers` for single charts and inside `positions` for arrays. Outside the orb
+the deflection is below 0.25 arc-second.
+
+Accuracy, from `verify` over 100,000 random instants per body against
+swisseph's built-in Moshier ephemeris (no .se1 files installed): the longitude
+error stays below MAX_ERROR (1 arc-second) everywhere for every body.
+Re-run `verify` against the ephemeris files a deployment actually uses, and
+rebuild grids made before the deflection handling.
+
+    python ephemeris_grid.py build --out ephemeris_grid
+    python ephemeris_grid.py verify --grid ephemeris_grid --samples 100000
+
+A grid is saved as a directory of .npy files that every worker memory-maps
+(see tables.py); legacy single-file .npz grids are still readable but are
+loaded into each process. Deployments opt in with KUNDLI_EPHEMERIS=chebyshev
+(see ephemeris.py), reading the grid from KUNDLI_EPHEMERIS_GRID or else
+KUNDLI_TABLE_DIR/ephemeris_grid.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import swisseph as swe
+
+from ephemeris import swisseph_positions
+from tables import load_tables, save_tables
+
+GRID_START = 2415020.5  # 1900-01-01
+GRID_END = 2488069.5  # 2100-01-01
+
+# Documented worst-case longitude error in arc-seconds
+MAX_ERROR = 1.0
+
+# Degrees from the Sun within which planets are left to swisseph (see above)
+DEFLECTION_ORB = 2.0
+
+# body name -> (swisseph id, segment length in days, Chebyshev degree). Segments
+# stay short enough to follow the 13.7-day nutation term in every longitude.
+GRID_BODIES = {
+    'Sun': (swe.SUN, 16, 10),
+    'Moon': (swe.MOON, 4, 14),
+    'Mars': (swe.MARS, 16, 12),
+    'Mercury': (swe.MERCURY, 4, 14),
+    'Venus': (swe.VENUS, 16, 12),
+    'Jupiter': (swe.JUPITER, 16, 10),
+    'Saturn': (swe.SATURN, 16, 10),
+    'Neptune': (swe.NEPTUNE, 16, 10),
+    'Uranus': (swe.URANUS, 16, 10),
+    'Pluto': (swe.PLUTO, 16, 10),
+    'Rahu': (swe.MEAN_NODE, 16, 10)
+}
+
+# Bodies swisseph applies light deflection to: all but the Sun, Moon and node
+DEFLECTED_BODIES = {
+    planet_num for name, (planet_num, _, _) in GRID_BODIES.items() if name not in ('Sun', 'Moon', 'Rahu')
+}
+
+
+def _chebyshev_nodes(degree):
+    k = np.arange(degree + 1)
+    return np.cos(np.pi * (k + 0.5) / (degree + 1))[::-1]
+
+
+def _fit_matrix(degree):
+    # Coefficients = values @ M for samples taken at the Chebyshev nodes
+    x = _chebyshev_nodes(degree)
+    vander = np.polynomial.chebyshev.chebvander(x, degree)
+    return np.linalg.inv(vander).T
+
+
+def build_grid(start=GRID_START, end=GRID_END, bodies=GRID_BODIES):
+    """
+    Fit every body over [start, end) and return the arrays making up a grid file
+    """
+    arrays = {'span': np.array([start, end])}
+    for name, (planet_num, segment_days, degree) in bodies.items():
+        segments = int(np.ceil((end - start) / segment_days))
+        nodes = (_chebyshev_nodes(degree) + 1) * segment_days / 2
+        julian_days = (start + segment_days * np.arange(segments))[:, None] + nodes
+        longitudes, speeds = swisseph_positions(
+            planet_num, julian_days.ravel(), swe.FLG_SWIEPH | swe.FLG_SPEED | swe.FLG_NOGDEFL
+        )
+
+        # Unwrap within each segment so the fitted function is continuous
+        longitudes = np.unwrap(longitudes.reshape(segments, -1), period=360, axis=1)
+        fit = _fit_matrix(degree)
+        arrays[f'{name}.longitude'] = longitudes @ fit
+        arrays[f'{name}.speed'] = speeds.reshape(segments, -1) @ fit
+        arrays[f'{name}.segment_days'] = np.array(segment_days, dtype=np.float64)
+    return arrays
+
+
+def _clenshaw(coefficients, x):
+    # Evaluate one Chebyshev series per row of coefficients at the matching x
+    b1 = np.zeros_like(x)
+    b2 = np.zeros_like(x)
+    for k in range(coefficients.shape[1] - 1, 0, -1):
+        b1, b2 = 2 * x * b1 - b2 + coefficients[:, k], b1
+    return x * b1 - b2 + coefficients[:, 0]
+
+
+class EphemerisGrid:
+    """
+    Sidereal longitudes and speeds for GRID_BODIES from a grid file
+    """
+
+    def __init__(self, arrays):
+        self.start, self.end = (float(v) for v in arrays['span'])
+        self.bodies = {}
+        for name, (planet_num, _, _) in GRID_BODIES.items():
+            if f'{name}.longitude' not in arrays:
+                continue
+            self.bodies[planet_num] = (
+                float(arrays[f'{name}.segment_days']),
+                arrays[f'{name}.longitude'],
+                arrays[f'{name}.speed']
+            )
+
+    @classmethod
+    def load(cls, path):
+        if os.path.isdir(path):
+            return cls(load_tables(path))
+        with np.load(path) as arrays:
+            return cls({key: arrays[key] for key in arrays.files})
+
+    def save(self, path):
+        """
+        Write the grid as a directory of memory-mappable .npy files
+        """
+        arrays = {'span': np.array([self.start, self.end])}
+        for name, (planet_num, _, _) in GRID_BODIES.items():
+            if planet_num in self.bodies:
+                segment_days, longitude, speed = self.bodies[planet_num]
+                arrays[f'{name}.longitude'] = longitude
+                arrays[f'{name}.speed'] = speed
+                arrays[f'{name}.segment_days'] = np.array(segment_days)
+        save_tables(path, arrays)
+
+    def covers(self, planet_num, julian_day):
+        return (planet_num in self.bodies and self.start <= julian_day < self.end
+                and not self.near_sun(planet_num, [julian_day])[0])
+
+    def _evaluate(self, planet_num, julian_days):
+        segment_days, longitude, speed = self.bodies[planet_num]
+        offset = julian_days - self.start
+        segment = np.minimum((offset // segment_days).astype(np.int64), len(longitude) - 1)
+        x = 2 * (offset - segment * segment_days) / segment_days - 1
+        return (
+            _clenshaw(longitude[segment], x) % 360,
+            _clenshaw(speed[segment], x)
+        )
+
+    def near_sun(self, planet_num, julian_days, longitudes=None):
+        """
+        Which dates put a deflected planet within DEFLECTION_ORB of the Sun
+        """
+        julian_days = np.asarray(julian_days, dtype=np.float64)
+        if planet_num not in DEFLECTED_BODIES or swe.SUN not in self.bodies:
+            return np.zeros(julian_days.shape, dtype=bool)
+        if longitudes is None:
+            longitudes, _ = self._evaluate(planet_num, julian_days)
+        sun, _ = self._evaluate(swe.SUN, julian_days)
+        return np.abs((longitudes - sun + 180) % 360 - 180) < DEFLECTION_ORB
+
+    def positions(self, planet_num, julian_days):
+        """
+        Sidereal (longitudes, speeds) arrays for an array of UT Julian days
+        """
+        julian_days = np.asarray(julian_days, dtype=np.float64)
+        if np.any(julian_days < self.start) or np.any(julian_days >= self.end):
+            raise ValueError("Date outside the precomputed ephemeris range")
+
+        longitudes, speeds = self._evaluate(planet_num, julian_days)
+        near = self.near_sun(planet_num, julian_days, longitudes)
+        if near.any():
+            longitudes[near], speeds[near] = swisseph_positions(planet_num, julian_days[near])
+        return longitudes, speeds
+
+    def position(self, planet_num, julian_day):
+        longitudes, speeds = self.positions(planet_num, [julian_day])
+        return float(longitudes[0]), float(speeds[0])
+
+
+def verify_grid(grid, samples, seed=0):
+    """
+    |grid - swisseph| per body over random instants, in arc-seconds (speed: per day).
+
+    Returns name -> (max longitude error, 99.9th percentile longitude error, max speed error).
+    """
+    rng = np.random.default_rng(seed)
+    report = {}
+    for name, (planet_num, _, _) in GRID_BODIES.items():
+        if planet_num not in grid.bodies:
+            continue
+        julian_days = rng.uniform(grid.start, grid.end, samples)
+        expected_longitudes, expected_speeds = swisseph_positions(planet_num, julian_days)
+        longitudes, speeds = grid.positions(planet_num, julian_days)
+        longitude_error = np.abs((longitudes - expected_longitudes + 180) % 360 - 180)
+        report[name] = (
+            longitude_error.max() * 3600,
+            np.percentile(longitude_error, 99.9) * 3600,
+            np.abs(speeds - expected_speeds).max() * 3600
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or verify the Chebyshev ephemeris grid")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build')
+    build.add_argument('--out', default='ephemeris_grid')
+    verify = subparsers.add_parser('verify')
+    verify.add_argument('--grid', default='ephemeris_grid')
+    verify.add_argument('--samples', type=int, default=20000)
+    verify.add_argument('--max-error', type=float, default=MAX_ERROR,
+                        help='worst-case longitude tolerance in arc-seconds')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        grid = EphemerisGrid(build_grid())
+        grid.save(args.out)
+        size = sum(os.path.getsize(os.path.join(args.out, f)) for f in os.listdir(args.out))
+        print(f"Built {args.out} in {time.perf_counter() - started:.1f}s ({size / 1e6:.1f} MB)")
+        return 0
+
+    grid = EphemerisGrid.load(args.grid)
+    worst = 0.0
+    for name, (longitude_error, p999, speed_error) in verify_grid(grid, args.samples).items():
+        worst = max(worst, longitude_error)
+        print(f"{name:8s} longitude max {longitude_error:8.4f}\"  p99.9 {p999:8.4f}\"  "
+              f"speed max {speed_error:8.4f}\"/day")
+    print(f"max longitude error {worst:.4f}\" (limit {args.max_error}\")")
+    return 0 if worst < args.max_error else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
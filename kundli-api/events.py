@@ -0,0 +1,233 @@
+"""
+Exact times at which bodies enter a new sign, nakshatra or pada.
+
+Each body is sampled on a coarse grid (one vectorized positions call), every
+step whose division index changes becomes a bracket, and all brackets are then
+refined together by Newton iteration on the sidereal longitude, using the
+backend's speed and falling back to bisection whenever a Newton step would
+leave its bracket. Longitudes are the same Lahiri sidereal longitudes charts
+use (see ephemeris.py).
+
+A body that crosses a boundary and comes back within one coarse step, which only
+happens within a few arc-minutes of a station, is not reported.
+
+Results are computed a calendar year at a time and cached (YearTables), so the
+ranges calendar views ask for are assembled from a handful of cached tables.
+"""
+import numpy as np
+import swisseph as swe
+
+from ephemeris import get_backend
+from transits import format_ist
+from zodiac import BODIES, NAKSHATRA_SPAN, RASHI_ORDER, nakshatras
+
+# Size of each division in degrees
+DIVISIONS = {
+    'sign': 30,
+    'nakshatra': NAKSHATRA_SPAN,
+    'pada': NAKSHATRA_SPAN / 4
+}
+
+# Coarse sampling step in days; the Moon moves up to ~15 degrees a day
+COARSE_STEPS = {'Moon': 0.25}
+DEFAULT_COARSE_STEP = 1.0
+
+# Newton/bisection stops at 1e-7 degree or a bracket of ~1 ms
+LONGITUDE_TOLERANCE = 1e-7
+TIME_TOLERANCE = 1e-8
+MAX_ITERATIONS = 60
+
+
+def body_longitudes(backend, body, julian_days):
+    """
+    Sidereal (longitudes, speeds) of a body by name; Ketu is Rahu + 180
+    """
+    longitudes, speeds = backend.positions(BODIES[body], julian_days)
+    if body == 'Ketu':
+        longitudes = (longitudes + 180) % 360
+    return longitudes, speeds
+
+
+def division_name(division, index):
+    index = int(index)
+    if division == 'sign':
+        return RASHI_ORDER[index % 12]
+    if division == 'nakshatra':
+        return nakshatras[index % 27][0]
+    return f"{nakshatras[index % 108 // 4][0]} {index % 4 + 1}"
+
+
+def solve_crossings(angle, lower, upper, boundaries, directions, guesses):
+    """
+    Julian days in [lower, upper] at which `angle` equals `boundaries`.
+
+    `angle(julian_days)` returns (angles in degrees, rates in degrees/day), e.g.
+    a body's longitude and speed. Every bracket must contain exactly one
+    crossing, made in `directions` (+1 increasing, -1 decreasing); all are
+    refined at once from `guesses`.
+    """
+    lower = np.array(lower, dtype=np.float64)
+    upper = np.array(upper, dtype=np.float64)
+    boundaries = np.asarray(boundaries, dtype=np.float64) % 360
+    sign = np.asarray(directions, dtype=np.float64)
+
+    def offset(julian_days, targets):
+        angles, rates = angle(julian_days)
+        return (angles - targets + 180) % 360 - 180, rates
+
+    times = np.array(guesses, dtype=np.float64)
+    active = np.arange(len(times))
+    for _ in range(MAX_ITERATIONS):
+        if not len(active):
+            break
+        value, speed = offset(times[active], boundaries[active])
+        converged = np.abs(value) < LONGITUDE_TOLERANCE
+
+        below = sign[active] * value < 0
+        lower[active] = np.where(below, times[active], lower[active])
+        upper[active] = np.where(below, upper[active], times[active])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = times[active] - value / speed
+        inside = np.isfinite(newton) & (newton > lower[active]) & (newton < upper[active])
+        step = np.where(inside, newton, (lower[active] + upper[active]) / 2)
+        times[active] = np.where(converged, times[active], step)
+
+        done = converged | (upper[active] - lower[active] < TIME_TOLERANCE)
+        active = active[~done]
+    return times
+
+
+def find_crossings(angle, julian_days, size):
+    """
+    Every time `angle` crosses a multiple of `size` degrees between the samples.
+
+    Returns (times, boundaries, directions): boundary k is the angle k * size,
+    counted on the angle unwrapped from its value at the first sample.
+    """
+    angles, _ = angle(julian_days)
+    unwrapped = np.unwrap(angles, period=360)
+    index = np.floor(unwrapped / size).astype(np.int64)
+
+    # One bracket per boundary crossed in a step (the Moon can cross two padas),
+    # and a first guess interpolated between the samples
+    lower, upper, crossed, directions, guesses = [], [], [], [], []
+    for i in np.flatnonzero(np.diff(index)):
+        direction = 1 if index[i + 1] > index[i] else -1
+        for boundary in range(index[i] + (direction > 0), index[i + 1] + (direction > 0), direction):
+            fraction = (boundary * size - unwrapped[i]) / (unwrapped[i + 1] - unwrapped[i])
+            lower.append(julian_days[i])
+            upper.append(julian_days[i + 1])
+            crossed.append(boundary)
+            directions.append(direction)
+            guesses.append(julian_days[i] + fraction * (julian_days[i + 1] - julian_days[i]))
+
+    crossed = np.array(crossed, dtype=np.int64)
+    directions = np.array(directions, dtype=np.int64)
+    if not len(crossed):
+        return np.empty(0), crossed, directions
+    return solve_crossings(angle, lower, upper, crossed * size, directions, guesses), crossed, directions
+
+
+def find_changes(state, julian_days, bisections):
+    """
+    Every time the boolean `state(julian_days)` changes between the samples.
+
+    All brackets are bisected together `bisections` times. Returns (times,
+    before, first): the midpoint of each final bracket, the state just before
+    each change, and the state at the first sample.
+    """
+    states = state(julian_days)
+    changed = np.flatnonzero(states[1:] != states[:-1])
+    lower, upper = julian_days[changed], julian_days[changed + 1]
+    before = states[changed]
+    for _ in range(bisections):
+        if not len(changed):
+            break
+        middle = (lower + upper) / 2
+        unchanged = state(middle) == before
+        lower = np.where(unchanged, middle, lower)
+        upper = np.where(unchanged, upper, middle)
+    return (lower + upper) / 2, before, bool(states[0])
+
+
+def find_ingresses(body, start, end, divisions=tuple(DIVISIONS), ephemeris=None):
+    """
+    Every entry of `body` into a new division in [start, end), sorted by time
+    """
+    backend = get_backend(ephemeris)
+    step = COARSE_STEPS.get(body, DEFAULT_COARSE_STEP)
+    julian_days = np.append(np.arange(start, end, step), end)
+
+    # Every sign and nakshatra boundary is also a pada boundary, so only the
+    # finest division requested is solved for and the others are read off it
+    size = min(DIVISIONS[division] for division in divisions)
+    times, crossed, directions = find_crossings(
+        lambda julian_days: body_longitudes(backend, body, julian_days), julian_days, size
+    )
+    labels = format_ist(times)
+    events = []
+    for division in divisions:
+        ratio = round(DIVISIONS[division] / size)
+        for julian_day, time, boundary, direction in zip(times, labels, crossed, directions):
+            if boundary % ratio:
+                continue
+            entered = boundary // ratio - (direction < 0)
+            events.append({
+                'body': body,
+                'type': division,
+                'julian_day': float(julian_day),
+                'time': time,
+                'from': division_name(division, entered - direction),
+                'to': division_name(division, entered),
+                'direction': 'direct' if direction > 0 else 'retrograde'
+            })
+
+    events.sort(key=lambda event: event['julian_day'])
+    return [event for event in events if start <= event['julian_day'] < end]
+
+
+def year_span(year):
+    """
+    (start, end) Julian days (UT) of a calendar year
+    """
+    return swe.julday(year, 1, 1, 0.0), swe.julday(year + 1, 1, 1, 0.0)
+
+
+def ingress_table(year, body, ephemeris=None):
+    return find_ingresses(body, *year_span(year), ephemeris=ephemeris)
+
+
+class YearTables:
+    """
+    Per-year event tables from `compute(year, *args)`, cached and joined into ranges.
+
+    Missing years are computed through `executor` (anything with `submit`, e.g.
+    a ChartExecutor) and stored in `cache` (an LRUCache or TieredCache).
+    """
+
+    def __init__(self, compute, cache, executor):
+        self.compute = compute
+        self.cache = cache
+        self.executor = executor
+
+    def get(self, start, end, *args):
+        """
+        Events with julian_day in [start, end) for every argument tuple in `args`
+        """
+        first_year = swe.revjul(start)[0]
+        last_year = swe.revjul(end)[0]
+        keys = [(year,) + tuple(arg) for arg in args for year in range(first_year, last_year + 1)]
+
+        tables = {key: self.cache.get(key) for key in keys}
+        pending = {key: self.executor.submit(self.compute, *key) for key in keys if tables[key] is None}
+        for key, future in pending.items():
+            tables[key] = future.result()
+            self.cache.put(key, tables[key])
+
+        events = [
+            event for key in keys for event in tables[key]
+            if start <= event['julian_day'] < end
+        ]
+        events.sort(key=lambda event: event['julian_day'])
+        return events
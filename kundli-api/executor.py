@@ -0,0 +1,146 @@
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import swisseph as swe
+
+import resources
+
+# Swiss Ephemeris keeps sidereal mode and ephemeris state as C globals (only
+# thread-local in some builds), so two threads computing charts at once can read
+# each other's settings. Every computation therefore runs either in a worker
+# process (one chart at a time per process, each with its own ephemeris context)
+# or, inline, under SWE_LOCK.
+SWE_LOCK = threading.Lock()
+
+EXECUTOR_MODES = ('process', 'inline')
+
+
+def init_worker():
+    """
+    Set up the ephemeris context owned by one worker process
+    """
+    resources.configure_swisseph()
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+
+
+def _copy_outcome(source, target):
+    error = source.exception()
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
+
+
+class ChartExecutor:
+    """
+    Dispatching front end for chart computations.
+
+    `mode='process'` sends work to a bounded pool of worker processes;
+    `mode='inline'` runs it in the calling thread, serialized by SWE_LOCK.
+    Functions must be module-level so they can be sent to a worker.
+
+    A worker dying (OOM kill, signal, crash) breaks the whole process pool; the
+    broken pool is then replaced and each task it took down is retried once on
+    the new one before BrokenProcessPool reaches the caller.
+    """
+
+    def __init__(self, mode='process', workers=None, chunksize=16):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unsupported executor mode: {mode}")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # spawn, not fork: the server process is multi-threaded
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=init_worker
+                    )
+        return self._pool
+
+    def _replace_pool(self, broken):
+        with self._pool_lock:
+            if self._pool is broken:
+                self._pool = None
+        # Not waiting: this can run on the broken pool's own management thread
+        broken.shutdown(wait=False)
+
+    def _submit(self, fn, args, retries):
+        pool = self.pool
+        try:
+            inner = pool.submit(fn, *args)
+        except BrokenProcessPool:
+            if not retries:
+                raise
+            self._replace_pool(pool)
+            return self._submit(fn, args, retries - 1)
+
+        future = Future()
+
+        def done(inner):
+            error = inner.exception()
+            if isinstance(error, BrokenProcessPool) and retries:
+                self._replace_pool(pool)
+                try:
+                    retried = self._submit(fn, args, retries - 1)
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    retried.add_done_callback(lambda retried: _copy_outcome(retried, future))
+            else:
+                _copy_outcome(inner, future)
+
+        inner.add_done_callback(done)
+        return future
+
+    def submit(self, fn, *args):
+        if self.mode == 'process':
+            return self._submit(fn, args, retries=1)
+
+        future = Future()
+        try:
+            with SWE_LOCK:
+                future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def run(self, fn, *args):
+        return self.submit(fn, *args).result()
+
+    def map_chunks(self, fn, items):
+        """
+        Yield fn(chunk) results for consecutive chunks of items, flattened, in order.
+
+        Only a couple of chunks per worker are in flight at any time, so memory
+        stays flat however long `items` is.
+        """
+        if self.mode == 'inline' or len(items) <= 1:
+            for i in range(0, len(items), self.chunksize):
+                yield from self.run(fn, items[i:i + self.chunksize])
+            return
+
+        pending = deque()
+        for i in range(0, len(items), self.chunksize):
+            pending.append(self.submit(fn, items[i:i + self.chunksize]))
+            if len(pending) >= self.workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
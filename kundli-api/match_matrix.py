@@ -0,0 +1,121 @@
+"""
+All-pairs Ashtakoota matching for a cohort, keeping each profile's top K matches.
+
+Every male is scored against every female without ever holding the full matrix:
+a task ranks one block of profiles against everyone of the other gender,
+BLOCK columns at a time, keeping a running top K per profile, and returns only
+that. Tasks run on a ChartExecutor process pool. Ties go to the profile earlier
+in the cohort, so results do not depend on the block size.
+
+Profiles are JSON lines, each with a `gender` and anything /match accepts for a
+candidate (a birth record, a moon_longitude or a kundli); `id` defaults to the
+line number. The result is one compressed .npz:
+
+    ids      (N,)    profile ids in input order
+    matches  (N, K)  cohort indices of each profile's best matches, best first (-1 pads)
+    points   (N, K)  their total points (float16, exact for half-points; NaN pads)
+
+    python match_matrix.py cohort.jsonl --out cohort_matches.npz --top 20
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+import resources
+from executor import ChartExecutor
+from matching import moon_indices, moon_longitudes, parse_gender, total_points
+
+# Profiles per side of one block of scores
+BLOCK = int(os.environ.get('KUNDLI_MATCH_BLOCK', 1024))
+
+
+def rank_block(rows, columns, rows_are_boys, top, block=BLOCK):
+    """
+    Process-pool task: for each row, the `top` best columns as (indices, points)
+
+    `rows` and `columns` are moon_indices of the two sides. Scores are ranked by
+    one int64 key, half-points * n + (n - 1 - column), so ties favour earlier columns.
+    """
+    count = len(columns['nakshatra'])
+    row_indices = {index: values[:, None] for index, values in rows.items()}
+    best = np.empty((len(rows['nakshatra']), 0), dtype=np.int64)
+    for start in range(0, count, block):
+        stop = min(start + block, count)
+        column_indices = {index: values[None, start:stop] for index, values in columns.items()}
+        if rows_are_boys:
+            points = total_points(row_indices, column_indices)
+        else:
+            points = total_points(column_indices, row_indices)
+        keys = np.rint(points * 2).astype(np.int64) * count + (count - 1 - np.arange(start, stop))
+        best = np.hstack([best, keys])
+        if best.shape[1] > top:
+            best = np.partition(best, -top, axis=1)[:, -top:]
+
+    best = -np.sort(-best, axis=1)
+    return count - 1 - best % count, (best // count) / 2
+
+
+def cohort_matches(profiles, top, executor, block=BLOCK, ephemeris=None):
+    """
+    (matches, points) arrays of shape (N, top) for a list of profiles
+    """
+    genders = np.array([parse_gender(profile.get('gender')) for profile in profiles])
+    indices = moon_indices(moon_longitudes(profiles, ephemeris))
+    males = np.flatnonzero(genders == 'male')
+    females = np.flatnonzero(genders == 'female')
+
+    matches = np.full((len(profiles), top), -1, dtype=np.int32)
+    points = np.full((len(profiles), top), np.nan, dtype=np.float16)
+    tasks = []
+    for side, others, rows_are_boys in ((males, females, True), (females, males, False)):
+        if not len(side) or not len(others):
+            continue
+        columns = {index: values[others] for index, values in indices.items()}
+        for start in range(0, len(side), block):
+            members = side[start:start + block]
+            rows = {index: values[members] for index, values in indices.items()}
+            future = executor.submit(rank_block, rows, columns, rows_are_boys, top, block)
+            tasks.append((members, others, future))
+
+    for members, others, future in tasks:
+        found, scores = future.result()
+        width = found.shape[1]
+        matches[members, :width] = others[found]
+        points[members, :width] = scores
+    return matches, points
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('profiles', help="JSON lines file, one profile per line")
+    parser.add_argument('--out', required=True)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--block', type=int, default=BLOCK)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--executor', default='process')
+    parser.add_argument('--ephemeris', default=None)
+    args = parser.parse_args()
+
+    with open(args.profiles) as f:
+        profiles = [json.loads(line) for line in f if line.strip()]
+    ids = np.array([str(profile.get('id', i)) for i, profile in enumerate(profiles)])
+
+    resources.configure_swisseph()
+    executor = ChartExecutor(mode=args.executor, workers=args.workers)
+    started = time.perf_counter()
+    try:
+        matches, points = cohort_matches(profiles, args.top, executor, args.block, args.ephemeris)
+    finally:
+        executor.shutdown()
+
+    np.savez_compressed(args.out, ids=ids, matches=matches, points=points)
+    print(f"Wrote top {args.top} matches for {len(profiles):,} profiles to {args.out} "
+          f"in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,252 @@
+"""
+Ashtakoota (guna milan) compatibility from the Moon's nakshatra and rashi.
+
+Each of the eight kootas is a precomputed table indexed by the boy's and the
+girl's Moon: by nakshatra (27 x 27) for tara, yoni, gana and nadi, by rashi
+(12 x 12) for varna, graha maitri and bhakoot, and by half-sign (24 x 24) for
+vashya, since Sagittarius and Capricorn each straddle two vashya groups.
+Scoring any number of pairs is one fancy-index into each table.
+
+Nakshatra and rashi are read from the sidereal Moon longitude exactly as
+get_nakshatra does. Dosha cancellations (the nadi and bhakoot exceptions) are
+not applied.
+"""
+import numpy as np
+
+from dignity import BODY_INDEX, NATURAL_RELATIONSHIPS
+from ephemeris import get_backend
+from transits import NAKSHATRA_NAMES, RASHI_NAMES, parse_ist
+from zodiac import BODIES, NAKSHATRA_SPAN, RASHI_ORDER, rashis
+
+# Maximum points of each koota, in the traditional order (36 in all)
+KOOTA_POINTS = {
+    'varna': 1,
+    'vashya': 2,
+    'tara': 3,
+    'yoni': 4,
+    'graha_maitri': 5,
+    'gana': 6,
+    'bhakoot': 7,
+    'nadi': 8
+}
+TOTAL_POINTS = sum(KOOTA_POINTS.values())
+
+GENDERS = ('male', 'female')
+
+# Varna rank by rashi: water signs Brahmin (4), fire Kshatriya (3), earth
+# Vaishya (2), air Shudra (1)
+VARNA_RANKS = np.array([3, 2, 1, 4] * 3)
+
+# Vashya group by half-sign: Chatushpada, Manava, Jalachara, Vanachara, Keeta
+CHATUSHPADA, MANAVA, JALACHARA, VANACHARA, KEETA = range(5)
+VASHYA_GROUPS = np.array([
+    CHATUSHPADA, CHATUSHPADA, CHATUSHPADA, CHATUSHPADA, MANAVA, MANAVA,  # Aries .. Gemini
+    JALACHARA, JALACHARA, VANACHARA, VANACHARA, MANAVA, MANAVA,  # Cancer .. Virgo
+    MANAVA, MANAVA, KEETA, KEETA, MANAVA, CHATUSHPADA,  # Libra .. Sagittarius
+    CHATUSHPADA, JALACHARA, MANAVA, MANAVA, JALACHARA, JALACHARA  # Capricorn .. Pisces
+])
+# Points by (boy's group, girl's group)
+VASHYA_POINTS = np.array([
+    [2, 1, 1, 0.5, 1],
+    [1, 2, 0.5, 0, 1],
+    [1, 0.5, 2, 1, 1],
+    [0.5, 0, 1, 2, 0],
+    [1, 1, 1, 0, 2]
+])
+
+# Taras 3 (vipat), 5 (pratyak) and 7 (vadha) counted from the other's nakshatra
+BAD_TARAS = (3, 5, 7)
+
+# Yoni animal of each nakshatra, and points by (boy's animal, girl's animal)
+YONI_ANIMALS = ('Horse', 'Elephant', 'Sheep', 'Serpent', 'Dog', 'Cat', 'Rat',
+                'Cow', 'Buffalo', 'Tiger', 'Deer', 'Monkey', 'Mongoose', 'Lion')
+NAKSHATRA_YONIS = np.array([
+    0, 1, 2, 3, 3, 4, 5, 2, 5,  # Ashwini .. Ashlesha
+    6, 6, 7, 8, 9, 8, 9, 10, 10,  # Magha .. Jyeshtha
+    4, 11, 12, 11, 13, 0, 13, 7, 1  # Mula .. Revati
+])
+YONI_POINTS = np.array([
+    [4, 2, 2, 3, 2, 2, 2, 1, 0, 1, 3, 3, 2, 1],
+    [2, 4, 3, 3, 2, 2, 2, 2, 3, 1, 2, 3, 2, 0],
+    [2, 3, 4, 2, 1, 2, 1, 3, 3, 1, 2, 0, 3, 1],
+    [3, 3, 2, 4, 2, 1, 1, 1, 1, 2, 2, 2, 0, 2],
+    [2, 2, 1, 2, 4, 2, 1, 2, 2, 1, 0, 2, 1, 1],
+    [2, 2, 2, 1, 2, 4, 0, 2, 2, 1, 3, 3, 2, 1],
+    [2, 2, 1, 1, 1, 0, 4, 2, 2, 2, 2, 2, 1, 2],
+    [1, 2, 3, 1, 2, 2, 2, 4, 3, 0, 3, 2, 2, 1],
+    [0, 3, 3, 1, 2, 2, 2, 3, 4, 1, 2, 2, 2, 1],
+    [1, 1, 1, 2, 1, 1, 2, 0, 1, 4, 1, 1, 2, 1],
+    [3, 2, 2, 2, 0, 3, 2, 3, 2, 1, 4, 2, 2, 1],
+    [3, 3, 0, 2, 2, 3, 2, 2, 2, 1, 2, 4, 3, 2],
+    [2, 2, 3, 0, 1, 2, 1, 2, 2, 2, 2, 3, 4, 2],
+    [1, 0, 1, 2, 1, 1, 2, 1, 1, 1, 1, 2, 2, 4]
+])
+
+# Gana of each nakshatra: Deva, Manushya, Rakshasa; points by (boy's, girl's)
+NAKSHATRA_GANAS = np.array([
+    0, 1, 2, 1, 0, 1, 0, 0, 2,
+    2, 1, 1, 0, 2, 0, 2, 0, 2,
+    2, 1, 1, 0, 2, 2, 1, 1, 0
+])
+GANA_POINTS = np.array([
+    [6, 6, 0],
+    [5, 6, 0],
+    [1, 0, 6]
+])
+
+# Nadi of each nakshatra: Adi, Madhya, Antya, zig-zagging from Ashwini
+NAKSHATRA_NADIS = np.tile([0, 1, 2, 2, 1, 0], 5)[:27]
+
+# Graha maitri points by how each Moon sign lord regards the other's:
+# enemy (0), neutral (1) or friend (2)
+MAITRI_POINTS = np.array([
+    [0, 0.5, 1],
+    [0.5, 3, 4],
+    [1, 4, 5]
+])
+
+# Boy's rashi counted from the girl's (0 = same sign) in the 2/12, 5/9 and 6/8 pairs
+BAD_BHAKOOTS = (1, 11, 4, 8, 5, 7)
+
+
+def _koota_tables():
+    nakshatra = np.arange(27)
+    boy, girl = nakshatra[:, None], nakshatra[None, :]
+    tara_from_girl = (boy - girl) % 27 % 9 + 1
+    tara_from_boy = (girl - boy) % 27 % 9 + 1
+
+    rashi = np.arange(12)
+    lords = [BODY_INDEX[rashis[sign]['lord']] for sign in RASHI_ORDER]
+    maitri = np.array([
+        [5 if lord == other else MAITRI_POINTS[NATURAL_RELATIONSHIPS[lord, other], NATURAL_RELATIONSHIPS[other, lord]]
+         for other in lords]
+        for lord in lords
+    ])
+
+    half_sign = np.arange(24)
+    return {
+        'varna': ('rashi', (VARNA_RANKS[:, None] >= VARNA_RANKS[None, :]) * 1.0),
+        'vashya': ('half_sign', VASHYA_POINTS[VASHYA_GROUPS[half_sign][:, None], VASHYA_GROUPS[half_sign][None, :]]),
+        'tara': ('nakshatra', 1.5 * ~np.isin(tara_from_girl, BAD_TARAS) + 1.5 * ~np.isin(tara_from_boy, BAD_TARAS)),
+        'yoni': ('nakshatra', YONI_POINTS[NAKSHATRA_YONIS[boy], NAKSHATRA_YONIS[girl]] * 1.0),
+        'graha_maitri': ('rashi', maitri),
+        'gana': ('nakshatra', GANA_POINTS[NAKSHATRA_GANAS[boy], NAKSHATRA_GANAS[girl]] * 1.0),
+        'bhakoot': ('rashi', 7.0 * ~np.isin((rashi[:, None] - rashi[None, :]) % 12, BAD_BHAKOOTS)),
+        'nadi': ('nakshatra', 8.0 * (NAKSHATRA_NADIS[boy] != NAKSHATRA_NADIS[girl]))
+    }
+
+
+# koota -> (what indexes it, table[boy, girl])
+KOOTA_TABLES = _koota_tables()
+
+
+def _total_tables():
+    totals = {}
+    for index, table in KOOTA_TABLES.values():
+        totals[index] = totals.get(index, 0) + table
+    return totals
+
+
+# The kootas summed per index, for when only the total is needed
+TOTAL_TABLES = _total_tables()
+
+
+def moon_indices(longitudes):
+    """
+    Nakshatra, rashi and half-sign indices of sidereal Moon longitudes
+    """
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    return {
+        'nakshatra': (longitudes / NAKSHATRA_SPAN).astype(np.int64) % 27,
+        'rashi': (longitudes / 30).astype(np.int64) % 12,
+        'half_sign': (longitudes / 15).astype(np.int64) % 24
+    }
+
+
+def score_kootas(boy_longitudes, girl_longitudes):
+    """
+    Points of every koota for boy and girl Moon longitudes (broadcast together)
+    """
+    boy = moon_indices(boy_longitudes)
+    girl = moon_indices(girl_longitudes)
+    return {koota: table[boy[index], girl[index]] for koota, (index, table) in KOOTA_TABLES.items()}
+
+
+def total_points(boy, girl):
+    """
+    Total points for boy and girl moon_indices (broadcast together)
+    """
+    return sum(table[boy[index], girl[index]] for index, table in TOTAL_TABLES.items())
+
+
+def moon_longitudes(records, ephemeris=None):
+    """
+    Sidereal Moon longitude of each record: its `moon_longitude`, the Moon of
+    its `kundli` (as /generate_kundli returns it), or the Moon at its
+    `date_of_birth` and `time_of_birth` (IST), all births in one backend call
+    """
+    longitudes = np.empty(len(records))
+    births, julian_days = [], []
+    for i, record in enumerate(records):
+        if record.get('moon_longitude') is not None:
+            longitudes[i] = float(record['moon_longitude']) % 360
+        elif record.get('kundli') is not None:
+            longitudes[i] = float(record['kundli']['Moon']['total_degrees']) % 360
+        else:
+            births.append(i)
+            julian_days.append(parse_ist(f"{record['date_of_birth']} {record['time_of_birth']}"))
+    if births:
+        longitudes[births] = get_backend(ephemeris).positions(BODIES['Moon'], julian_days)[0]
+    return longitudes
+
+
+def parse_gender(value):
+    gender = str(value).lower()
+    if gender not in GENDERS:
+        raise ValueError(f"Profile gender must be one of: {', '.join(GENDERS)}")
+    return gender
+
+
+def match(profile, candidates, ephemeris=None, top=None):
+    """
+    Ashtakoota scores of one profile against every candidate, best first when `top` is given
+    """
+    gender = parse_gender(profile.get('gender'))
+    profile_moon = moon_longitudes([profile], ephemeris)[0]
+    candidate_moons = moon_longitudes(candidates, ephemeris)
+    if gender == 'male':
+        scores = score_kootas(profile_moon, candidate_moons)
+    else:
+        scores = score_kootas(candidate_moons, profile_moon)
+    totals = sum(scores.values())
+
+    order = np.argsort(-totals, kind='stable')[:top] if top else np.arange(len(candidates))
+    indices = moon_indices(candidate_moons[order])
+    columns = {koota: points[order].tolist() for koota, points in scores.items()}
+    matches = [
+        {
+            'index': int(index),
+            'id': candidates[index].get('id'),
+            'nakshatra': nakshatra,
+            'rashi': rashi,
+            'total': total,
+            'kootas': {koota: columns[koota][i] for koota in KOOTA_POINTS}
+        }
+        for i, (index, nakshatra, rashi, total) in enumerate(zip(
+            order.tolist(),
+            NAKSHATRA_NAMES[indices['nakshatra']].tolist(),
+            RASHI_NAMES[indices['rashi']].tolist(),
+            totals[order].tolist()
+        ))
+    ]
+
+    profile_indices = moon_indices(profile_moon)
+    return {
+        'profile': {
+            'gender': gender,
+            'nakshatra': str(NAKSHATRA_NAMES[profile_indices['nakshatra']]),
+            'rashi': str(RASHI_NAMES[profile_indices['rashi']])
+        },
+        'max_points': TOTAL_POINTS,
+        'matches': matches
+    }
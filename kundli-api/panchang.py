@@ -0,0 +1,198 @@
+"""
+Panchang: vara, tithi, nakshatra, yoga, karana and lunar month, with the exact
+start and end of each.
+
+Every element is a division of an angle that only ever increases: the Moon's
+elongation from the Sun (30 tithis, 60 karanas), the sum of their sidereal
+longitudes (27 yogas) and the Moon's longitude (27 nakshatras). The crossings
+of all division boundaries over a window are found at once with the event
+solver (events.find_crossings), and each day then just looks up the element
+running at its reference time and the crossings either side of it, so a whole
+year of days costs one solve per angle.
+
+The lunar month is amanta (new moon to new moon), named from the sign the Sun
+is in at the new moon that starts it; a month without a solar ingress is adhika.
+
+A day's panchang is the one running at its sunrise at the given place (see
+riseset.py), or at REFERENCE_HOUR IST on days the Sun does not rise there.
+"""
+import numpy as np
+
+from ephemeris import get_backend
+from events import find_crossings
+from riseset import describe_rise_set, rise_set, year_dates
+from transits import format_ist
+from zodiac import BODIES, NAKSHATRA_SPAN, nakshatras
+
+VARAS = ('Ravivara', 'Somavara', 'Mangalavara', 'Budhavara', 'Guruvara', 'Shukravara', 'Shanivara')
+
+TITHIS = (
+    'Pratipada', 'Dwitiya', 'Tritiya', 'Chaturthi', 'Panchami', 'Shashthi', 'Saptami', 'Ashtami',
+    'Navami', 'Dashami', 'Ekadashi', 'Dwadashi', 'Trayodashi', 'Chaturdashi'
+)
+
+YOGAS = (
+    'Vishkambha', 'Priti', 'Ayushman', 'Saubhagya', 'Shobhana', 'Atiganda', 'Sukarma', 'Dhriti',
+    'Shula', 'Ganda', 'Vriddhi', 'Dhruva', 'Vyaghata', 'Harshana', 'Vajra', 'Siddhi', 'Vyatipata',
+    'Variyana', 'Parigha', 'Shiva', 'Siddha', 'Sadhya', 'Shubha', 'Shukla', 'Brahma', 'Indra', 'Vaidhriti'
+)
+
+# The seven movable karanas repeat eight times from the second half of Shukla
+# Pratipada; the fixed ones take the first half of it and the last three halves
+MOVABLE_KARANAS = ('Bava', 'Balava', 'Kaulava', 'Taitila', 'Gara', 'Vanija', 'Vishti')
+KARANAS = ('Kimstughna',) + MOVABLE_KARANAS * 8 + ('Shakuni', 'Chatushpada', 'Naga')
+
+LUNAR_MONTHS = (
+    'Chaitra', 'Vaishakha', 'Jyeshtha', 'Ashadha', 'Shravana', 'Bhadrapada',
+    'Ashwina', 'Kartika', 'Margashirsha', 'Pausha', 'Magha', 'Phalguna'
+)
+
+KARANA_SPAN = 6.0
+YOGA_SPAN = 360 / 27
+
+# Elongation, yoga and Moon advance at most ~16 degrees a day
+PANCHANG_STEP = 0.25
+# Days sampled either side of the reference times: enough for the new moons
+# around them (a lunar month is at most ~29.9 days)
+PANCHANG_MARGIN = 32.0
+
+# Hour of the IST morning used as the reference time of days without a sunrise
+REFERENCE_HOUR = 6
+
+
+def tithi_name(index):
+    if index == 14:
+        return 'Purnima'
+    if index == 29:
+        return 'Amavasya'
+    return TITHIS[index % 15]
+
+
+def vara_index(julian_day):
+    """
+    Weekday (0 = Sunday) of the IST calendar date at a Julian day (UT)
+    """
+    return int((np.floor(julian_day + 0.5 + 5.5 / 24) + 1) % 7)
+
+
+class SolarLunarAngles:
+    """
+    The angles panchang elements divide, each as (degrees, degrees/day) arrays
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def sun_moon(self, julian_days):
+        sun, sun_speed = self.backend.positions(BODIES['Sun'], julian_days)
+        moon, moon_speed = self.backend.positions(BODIES['Moon'], julian_days)
+        return sun, sun_speed, moon, moon_speed
+
+    def elongation(self, julian_days):
+        sun, sun_speed, moon, moon_speed = self.sun_moon(julian_days)
+        return (moon - sun) % 360, moon_speed - sun_speed
+
+    def yoga(self, julian_days):
+        sun, sun_speed, moon, moon_speed = self.sun_moon(julian_days)
+        return (moon + sun) % 360, moon_speed + sun_speed
+
+    def moon(self, julian_days):
+        return self.backend.positions(BODIES['Moon'], julian_days)
+
+
+def running(times, crossed, julian_days):
+    """
+    For each Julian day: (index of the division entered last, its start, its end)
+    """
+    i = np.searchsorted(times, julian_days, side='right')
+    return crossed[i - 1], times[i - 1], times[i]
+
+
+def describe(names, count, indices, starts, ends):
+    start_times = format_ist(starts)
+    end_times = format_ist(ends)
+    return [
+        {
+            'number': int(index % count) + 1,
+            'name': names(int(index % count)),
+            'start': float(start),
+            'end': float(end),
+            'start_time': start_time,
+            'end_time': end_time
+        }
+        for index, start, end, start_time, end_time in zip(indices, starts, ends, start_times, end_times)
+    ]
+
+
+def panchang(reference_julian_days, ephemeris=None):
+    """
+    Panchang of every reference time (UT Julian days) in one vectorized pass
+    """
+    reference_julian_days = np.atleast_1d(np.asarray(reference_julian_days, dtype=np.float64))
+    backend = get_backend(ephemeris)
+    angles = SolarLunarAngles(backend)
+    first = reference_julian_days.min() - PANCHANG_MARGIN
+    last = reference_julian_days.max() + PANCHANG_MARGIN
+    julian_days = np.append(np.arange(first, last, PANCHANG_STEP), last)
+
+    # Tithi boundaries are every other karana boundary
+    karana_times, karana_crossed, _ = find_crossings(angles.elongation, julian_days, KARANA_SPAN)
+    is_tithi = karana_crossed % 2 == 0
+    tithi_times, tithi_crossed = karana_times[is_tithi], karana_crossed[is_tithi] // 2
+    yoga_times, yoga_crossed, _ = find_crossings(angles.yoga, julian_days, YOGA_SPAN)
+    nakshatra_times, nakshatra_crossed, _ = find_crossings(angles.moon, julian_days, NAKSHATRA_SPAN)
+
+    tithis = describe(tithi_name, 30, *running(tithi_times, tithi_crossed, reference_julian_days))
+    karanas = describe(KARANAS.__getitem__, 60, *running(karana_times, karana_crossed, reference_julian_days))
+    yogas = describe(YOGAS.__getitem__, 27, *running(yoga_times, yoga_crossed, reference_julian_days))
+    moon_nakshatras = describe(lambda index: nakshatras[index][0], 27,
+                               *running(nakshatra_times, nakshatra_crossed, reference_julian_days))
+
+    # New moons are the tithi boundaries at elongation 0; the month runs from the
+    # one before each reference time to the one after it
+    is_new_moon = tithi_crossed % 30 == 0
+    new_moons = tithi_times[is_new_moon]
+    sun_signs = (backend.positions(BODIES['Sun'], new_moons)[0] // 30).astype(np.int64)
+    month = np.searchsorted(new_moons, reference_julian_days, side='right')
+    opening_signs = sun_signs[month - 1]
+    adhika = opening_signs == sun_signs[month]
+
+    days = []
+    for i, (julian_day, time) in enumerate(zip(reference_julian_days, format_ist(reference_julian_days))):
+        tithi = tithis[i]
+        tithi['paksha'] = 'Shukla' if tithi['number'] <= 15 else 'Krishna'
+        days.append({
+            'date': time[:10],
+            'julian_day': float(julian_day),
+            'time': time,
+            'vara': VARAS[vara_index(julian_day)],
+            'tithi': tithi,
+            'nakshatra': moon_nakshatras[i],
+            'yoga': yogas[i],
+            'karana': karanas[i],
+            'lunar_month': {
+                'name': LUNAR_MONTHS[(opening_signs[i] + 1) % 12],
+                'adhika': bool(adhika[i])
+            }
+        })
+    return days
+
+
+def daily_panchang(dates, lat, lon, ephemeris=None):
+    """
+    Panchang at sunrise of each date (0h UT Julian days) at a place, with its sun times
+    """
+    dates = np.atleast_1d(np.asarray(dates, dtype=np.float64))
+    sunrises, sunsets = rise_set(dates, lat, lon)
+    reference = np.where(np.isnan(sunrises), dates + (REFERENCE_HOUR - 5.5) / 24, sunrises)
+    days = panchang(reference, ephemeris)
+    for day, sun in zip(days, describe_rise_set(dates, sunrises, sunsets)):
+        day.update(sun)
+    return days
+
+
+def panchang_year(year, lat, lon, ephemeris=None):
+    """
+    Daily panchang for every date of a calendar year at one place
+    """
+    return daily_panchang(year_dates(year), lat, lon, ephemeris)
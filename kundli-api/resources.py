@@ -0,0 +1,133 @@
+"""
+Ephemeris files (skyfield kernels, Swiss Ephemeris .se1 files) read from one local directory.
+
+Nothing is ever downloaded: files are expected in KUNDLI_EPHE_DIR (default
+./ephe next to this module), listed with their SHA-256 in manifest.json there.
+Kernels are opened on first use and checked against the manifest when they are;
+a file with no manifest entry is never loaded. With KUNDLI_STRICT_RESOURCES=1
+the app verifies the whole directory at startup and refuses to start if anything
+is missing, corrupt or unlisted.
+
+    python resources.py manifest   # record checksums of the files in the directory
+    python resources.py verify
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+
+import swisseph as swe
+
+EPHE_DIR = os.environ.get(
+    'KUNDLI_EPHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ephe')
+)
+MANIFEST = 'manifest.json'
+STRICT = os.environ.get('KUNDLI_STRICT_RESOURCES') == '1'
+
+
+class ResourceError(RuntimeError):
+    pass
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest():
+    path = os.path.join(EPHE_DIR, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)['files']
+
+
+def _ephemeris_files():
+    return [
+        name for name in sorted(os.listdir(EPHE_DIR))
+        if name != MANIFEST and os.path.isfile(os.path.join(EPHE_DIR, name))
+    ]
+
+
+def verify_file(name, manifest=None):
+    """
+    Path of an ephemeris file, after checking it exists, is listed in the
+    manifest and matches its checksum there
+    """
+    manifest = read_manifest() if manifest is None else manifest
+    path = os.path.join(EPHE_DIR, name)
+    if not os.path.exists(path):
+        raise ResourceError(f"Ephemeris file {name} not found in {EPHE_DIR}")
+    if name not in manifest:
+        raise ResourceError(f"Ephemeris file {name} is not listed in {MANIFEST}")
+    if _sha256(path) != manifest[name]:
+        raise ResourceError(f"Ephemeris file {name} does not match its checksum in {MANIFEST}")
+    return path
+
+
+def verify_resources():
+    """
+    Check every file listed in the manifest, and that the directory holds no
+    others (swisseph would read them); raises ResourceError on the first problem
+    """
+    manifest = read_manifest()
+    if not manifest:
+        raise ResourceError(f"No {MANIFEST} in {EPHE_DIR}")
+    for name in manifest:
+        verify_file(name, manifest)
+    unlisted = sorted(set(_ephemeris_files()) - set(manifest))
+    if unlisted:
+        raise ResourceError(f"Ephemeris files not listed in {MANIFEST}: {', '.join(unlisted)}")
+    return sorted(manifest)
+
+
+def configure_swisseph():
+    """
+    Point swisseph at the local directory, so it uses any .se1 files found there
+    """
+    if os.path.isdir(EPHE_DIR):
+        swe.set_ephe_path(EPHE_DIR)
+
+
+_kernels = {}
+_kernels_lock = threading.Lock()
+
+
+def skyfield_kernel(name='de421.bsp'):
+    """
+    A skyfield SpiceKernel, opened from EPHE_DIR on first use
+    """
+    with _kernels_lock:
+        if name not in _kernels:
+            from skyfield.api import load_file
+            _kernels[name] = load_file(verify_file(name))
+        return _kernels[name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local ephemeris directory")
+    parser.add_argument('command', choices=['manifest', 'verify'])
+    args = parser.parse_args()
+
+    if args.command == 'manifest':
+        files = {name: _sha256(os.path.join(EPHE_DIR, name)) for name in _ephemeris_files()}
+        with open(os.path.join(EPHE_DIR, MANIFEST), 'w') as f:
+            json.dump({'files': files}, f, indent=2)
+        print(f"Recorded {len(files)} files in {os.path.join(EPHE_DIR, MANIFEST)}")
+        return 0
+
+    try:
+        names = verify_resources()
+    except ResourceError as e:
+        print(e)
+        return 1
+    print(f"{len(names)} files OK in {EPHE_DIR}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
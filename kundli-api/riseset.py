@@ -0,0 +1,115 @@
+"""
+Sunrise, sunset and day length for a date and place, from swe.rise_trans.
+
+Rising and setting are of the Sun's upper limb with standard refraction, the
+swisseph defaults. A date's sunrise is the first one after local mean midnight
+at the place, and its sunset the first one after that sunrise; both are None
+where the Sun does not rise or set that day.
+
+Results are cached per (date, location). Locations are snapped to a grid of
+KUNDLI_RISE_SET_GRID degrees first, so users in the same city share entries:
+0.05 degree moves a sunrise by at most ~6 seconds, well under the minute the
+times are reported to.
+"""
+import os
+
+import numpy as np
+import swisseph as swe
+
+from cache import LRUCache
+from transits import format_ist
+
+RISE_SET_GRID = float(os.environ.get('KUNDLI_RISE_SET_GRID', 0.05))
+
+# Per process, like the ephemeris backends
+rise_set_cache = LRUCache(int(os.environ.get('KUNDLI_RISE_SET_CACHE_SIZE', 100000)))
+
+
+def quantize_location(lat, lon):
+    """
+    (lat, lon) snapped to the rise/set grid
+    """
+    return (round(round(lat / RISE_SET_GRID) * RISE_SET_GRID, 6),
+            round(round(lon / RISE_SET_GRID) * RISE_SET_GRID, 6))
+
+
+def ist_dates(julian_days):
+    """
+    Julian day (0h UT) of the IST calendar date of each Julian day (UT)
+    """
+    return np.floor(np.asarray(julian_days) + 0.5 + 5.5 / 24) - 0.5
+
+
+def _next_event(julian_day, event, geopos):
+    result, times = swe.rise_trans(julian_day, swe.SUN, event, geopos)
+    return times[0] if result == 0 else None
+
+
+def compute_rise_set(date, lat, lon):
+    """
+    (sunrise, sunset) Julian days (UT) of the date starting at `date` (0h UT)
+    """
+    geopos = (lon, lat, 0.0)
+    midnight = date - lon / 360
+    sunrise = _next_event(midnight, swe.CALC_RISE, geopos)
+    sunset = _next_event(sunrise if sunrise is not None else midnight, swe.CALC_SET, geopos)
+    if sunset is not None and sunset >= midnight + 1:
+        sunset = None
+    return sunrise, sunset
+
+
+def rise_set(dates, lat, lon, context=None):
+    """
+    Sunrise and sunset arrays (NaN where there is none) for an array of dates (0h UT)
+
+    The whole range is one call, so a year of dates for a place is a single job
+    that fills the cache for all of them. The two rise_trans calls of every
+    date computed here (not cached) are added to `context.swe_calls` when a
+    chart_context.ChartContext is given.
+    """
+    lat, lon = quantize_location(lat, lon)
+    dates = np.atleast_1d(np.asarray(dates, dtype=np.float64))
+    sunrises = np.full(len(dates), np.nan)
+    sunsets = np.full(len(dates), np.nan)
+    for i, date in enumerate(dates):
+        key = (float(date), lat, lon)
+        times = rise_set_cache.get(key)
+        if times is None:
+            times = compute_rise_set(float(date), lat, lon)
+            rise_set_cache.put(key, times)
+            if context is not None:
+                context.swe_calls += 2
+        sunrise, sunset = times
+        if sunrise is not None:
+            sunrises[i] = sunrise
+        if sunset is not None:
+            sunsets[i] = sunset
+    return sunrises, sunsets
+
+
+def year_dates(year):
+    """
+    0h UT Julian days of every date in a calendar year
+    """
+    first = swe.julday(year, 1, 1, 0.0)
+    return first + np.arange(round(swe.julday(year + 1, 1, 1, 0.0) - first))
+
+
+def describe_rise_set(dates, sunrises, sunsets):
+    """
+    JSON-ready dicts per date; day_length is in hours
+    """
+    sunrise_times = format_ist(np.nan_to_num(sunrises))
+    sunset_times = format_ist(np.nan_to_num(sunsets))
+    days = []
+    for i, midnight in enumerate(format_ist(np.asarray(dates) - 5.5 / 24)):
+        sunrise, sunset = sunrises[i], sunsets[i]
+        days.append({
+            'date': midnight[:10],
+            'sunrise': None if np.isnan(sunrise) else float(sunrise),
+            'sunset': None if np.isnan(sunset) else float(sunset),
+            'sunrise_time': None if np.isnan(sunrise) else sunrise_times[i],
+            'sunset_time': None if np.isnan(sunset) else sunset_times[i],
+            'day_length': None if np.isnan(sunrise) or np.isnan(sunset) else float((sunset - sunrise) * 24)
+        })
+    return days
@@ -0,0 +1,78 @@
+"""
+Stations (longitude speed crossing zero) and retrograde periods of Mercury to Pluto.
+
+The speed is sampled daily, each day on which it changes sign becomes a bracket,
+and all brackets are bisected together on the speed itself (events.find_changes;
+calc_ut with FLG_SPEED for the swisseph backend). Stations of one planet are
+always weeks apart, so a daily sample never misses one.
+"""
+import numpy as np
+
+from ephemeris import get_backend
+from events import find_changes, year_span
+from transits import format_ist
+from zodiac import BODIES, RASHI_ORDER
+
+STATION_BODIES = ('Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Uranus', 'Neptune', 'Pluto')
+
+STATION_STEP = 1.0
+# Halvings of the one-day bracket: 2**-24 day is about 5 ms
+BISECTIONS = 24
+
+
+def find_stations(body, start, end, ephemeris=None):
+    """
+    Every station of `body` in [start, end), sorted by time.
+
+    `type` is 'retrograde' where the body turns retrograde and 'direct' where it
+    turns direct again.
+    """
+    backend = get_backend(ephemeris)
+    planet_num = BODIES[body]
+    julian_days = np.append(np.arange(start, end, STATION_STEP), end)
+    times, retro_before, _ = find_changes(
+        lambda julian_days: backend.positions(planet_num, julian_days)[1] < 0, julian_days, BISECTIONS
+    )
+    if not len(times):
+        return []
+    longitudes, _ = backend.positions(planet_num, times)
+    stations = [
+        {
+            'body': body,
+            'type': 'direct' if was_retro else 'retrograde',
+            'julian_day': float(julian_day),
+            'time': time,
+            'longitude': float(longitude),
+            'rashi': RASHI_ORDER[int(longitude / 30)]
+        }
+        for julian_day, time, longitude, was_retro in zip(times, format_ist(times), longitudes, retro_before)
+    ]
+    return [station for station in stations if start <= station['julian_day'] < end]
+
+
+def station_table(year, body, ephemeris=None):
+    return find_stations(body, *year_span(year), ephemeris=ephemeris)
+
+
+def retrograde_periods(stations):
+    """
+    Pair each retrograde station with the following direct station of the same body
+    """
+    periods = []
+    turned = {}
+    for station in sorted(stations, key=lambda station: station['julian_day']):
+        body = station['body']
+        if station['type'] == 'retrograde':
+            turned[body] = station
+        elif body in turned:
+            began = turned.pop(body)
+            periods.append({
+                'body': body,
+                'start': began['julian_day'],
+                'start_time': began['time'],
+                'start_longitude': began['longitude'],
+                'end': station['julian_day'],
+                'end_time': station['time'],
+                'end_longitude': station['longitude']
+            })
+    return periods
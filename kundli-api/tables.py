@@ -0,0 +1,66 @@
+"""
+Precomputed tables stored as one .npy file per array and opened with numpy.memmap.
+
+Every worker process that opens a table maps the same file, so all workers on a
+host share one copy in the page cache instead of each holding its own, and only
+the pages a query touches are ever read.
+
+    python tables.py build --out /srv/kundli-tables          # varga tables + ephemeris grid
+    python tables.py build --out /srv/kundli-tables --skip-grid
+
+Deployments point KUNDLI_TABLE_DIR at the directory.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+TABLE_DIR = os.environ.get('KUNDLI_TABLE_DIR')
+
+
+def save_tables(directory, arrays):
+    os.makedirs(directory, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, f'{name}.npy'), array)
+
+
+def load_tables(directory):
+    """
+    Memory-map every .npy file in a directory, keyed by file name without extension
+    """
+    return {
+        filename[:-len('.npy')]: np.load(os.path.join(directory, filename), mmap_mode='r')
+        for filename in sorted(os.listdir(directory))
+        if filename.endswith('.npy')
+    }
+
+
+def main():
+    from ephemeris_grid import EphemerisGrid, build_grid
+    from vargas import build_varga_tables
+
+    parser = argparse.ArgumentParser(description="Build the memory-mapped lookup tables")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build')
+    build.add_argument('--out', default=TABLE_DIR or 'tables')
+    build.add_argument('--skip-grid', action='store_true')
+    args = parser.parse_args()
+
+    varga_table, varga_boundary = build_varga_tables()
+    save_tables(os.path.join(args.out, 'vargas'), {
+        'table': varga_table,
+        'boundary': varga_boundary
+    })
+    print(f"Wrote varga tables to {os.path.join(args.out, 'vargas')}")
+
+    if not args.skip_grid:
+        started = time.perf_counter()
+        EphemerisGrid(build_grid()).save(os.path.join(args.out, 'ephemeris_grid'))
+        print(f"Wrote ephemeris grid to {os.path.join(args.out, 'ephemeris_grid')} "
+              f"in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
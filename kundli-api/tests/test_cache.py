@@ -0,0 +1,41 @@
+import sqlite3
+
+from cache import SQLiteCache
+
+
+def accessed(path):
+    with sqlite3.connect(path) as db:
+        return db.execute('SELECT accessed FROM charts').fetchone()[0]
+
+
+def test_locked_database_reads_and_writes_degrade(tmp_path):
+    path = str(tmp_path / 'charts.db')
+    cache = SQLiteCache(path, touch_every=1, timeout=0.05)
+    cache.put('a', {'chart': 1})
+
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute('BEGIN IMMEDIATE')
+    try:
+        cache.put('b', {'chart': 2})
+        assert cache.get('a') == {'chart': 1}
+        assert cache.get('b') is None
+    finally:
+        other.execute('ROLLBACK')
+        other.close()
+    assert cache.errors == 2
+
+    cache.put('b', {'chart': 2})
+    assert cache.get('b') == {'chart': 2}
+
+
+def test_hits_batch_their_access_times(tmp_path):
+    path = str(tmp_path / 'charts.db')
+    cache = SQLiteCache(path, touch_every=3)
+    cache.put('a', {'chart': 1})
+    written = accessed(path)
+
+    cache.get('a')
+    cache.get('a')
+    assert accessed(path) == written
+    cache.get('a')
+    assert accessed(path) > written
@@ -0,0 +1,34 @@
+import numpy as np
+
+from dignity import BODY_INDEX, DEBILITATED, DIGNITIES, EXALTED, NEUTRAL, body_dignity, statuses
+
+
+def status(body, longitude):
+    return DIGNITIES[int(statuses(BODY_INDEX[body], longitude))]
+
+
+def test_moon_moolatrikona_in_taurus():
+    assert body_dignity('Moon', 30 + 2) == 'Exalted'
+    assert body_dignity('Moon', 30 + 10) == 'Moolatrikona'
+    assert status('Moon', 30 + 10) == 'Exalted'
+
+
+def test_mercury_exalted_moolatrikona_and_own_in_virgo():
+    assert body_dignity('Mercury', 150 + 10) == 'Exalted'
+    assert body_dignity('Mercury', 150 + 17) == 'Moolatrikona'
+    assert body_dignity('Mercury', 150 + 25) == 'Own'
+    assert status('Mercury', 150 + 17) == 'Exalted'
+    assert status('Mercury', 150 + 25) == 'Exalted'
+
+
+def test_whole_sign_exaltation_elsewhere():
+    assert body_dignity('Sun', 29.9) == 'Exalted'
+    assert body_dignity('Sun', 120 + 10) == 'Moolatrikona'
+    assert body_dignity('Sun', 120 + 25) == 'Own'
+    assert body_dignity('Saturn', 0.5) == 'Debilitated'
+
+
+def test_statuses_are_exalted_debilitated_or_neutral():
+    bodies = np.repeat(np.arange(len(BODY_INDEX)), 12)
+    longitudes = np.tile(np.arange(12) * 30 + 15.0, len(BODY_INDEX))
+    assert set(statuses(bodies, longitudes).tolist()) <= {DEBILITATED, EXALTED, NEUTRAL}
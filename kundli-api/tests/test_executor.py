@@ -0,0 +1,27 @@
+import os
+import signal
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from executor import ChartExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = ChartExecutor(mode='process', workers=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_killed_worker_is_replaced(executor):
+    pid = executor.run(os.getpid)
+    os.kill(pid, signal.SIGKILL)
+    assert executor.run(os.getpid) != pid
+    assert list(executor.map_chunks(sorted, [3, 1, 2])) == [1, 2, 3]
+
+
+def test_task_killing_its_worker_fails_after_one_retry(executor):
+    with pytest.raises(BrokenProcessPool):
+        executor.run(os._exit, 1)
+    assert executor.run(abs, -1) == 1
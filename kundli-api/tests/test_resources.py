@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+import resources
+
+
+@pytest.fixture
+def ephe_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(resources, 'EPHE_DIR', str(tmp_path))
+    (tmp_path / 'de421.bsp').write_bytes(b'kernel')
+    files = {'de421.bsp': resources._sha256(tmp_path / 'de421.bsp')}
+    (tmp_path / resources.MANIFEST).write_text(json.dumps({'files': files}))
+    return tmp_path
+
+
+def test_listed_file_verifies(ephe_dir):
+    assert resources.verify_file('de421.bsp') == str(ephe_dir / 'de421.bsp')
+    assert resources.verify_resources() == ['de421.bsp']
+
+
+def test_replaced_file_is_refused(ephe_dir):
+    (ephe_dir / 'de421.bsp').write_bytes(b'other kernel')
+    with pytest.raises(resources.ResourceError, match='checksum'):
+        resources.verify_file('de421.bsp')
+
+
+def test_unlisted_file_is_refused(ephe_dir):
+    (ephe_dir / 'de440.bsp').write_bytes(b'extra kernel')
+    with pytest.raises(resources.ResourceError, match='not listed'):
+        resources.verify_file('de440.bsp')
+    with pytest.raises(resources.ResourceError, match='de440.bsp'):
+        resources.verify_resources()
+
+
+def test_no_manifest_loads_nothing(ephe_dir):
+    (ephe_dir / resources.MANIFEST).unlink()
+    with pytest.raises(resources.ResourceError, match='not listed'):
+        resources.verify_file('de421.bsp')
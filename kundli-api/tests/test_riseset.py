@@ -0,0 +1,15 @@
+from chart_context import ChartContext
+from riseset import ist_dates, rise_set, rise_set_cache
+
+
+def test_rise_trans_calls_are_counted_on_cache_misses_only():
+    julian_day, lat, lon = 2451545.0, 28.61, 77.21
+    rise_set_cache.clear()
+
+    context = ChartContext(julian_day, lat, lon)
+    rise_set(ist_dates(julian_day), lat, lon, context)
+    assert context.swe_calls == 2
+
+    context = ChartContext(julian_day, lat, lon)
+    rise_set(ist_dates(julian_day), lat, lon, context)
+    assert context.swe_calls == 0
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from transits import format_ist, transit_julian_days
+
+
+def test_range_includes_both_ends():
+    julian_days = transit_julian_days(2451545.0, 2451547.0, 0.5, 10)
+    assert np.allclose(julian_days, [2451545.0, 2451545.5, 2451546.0, 2451546.5, 2451547.0])
+
+
+def test_oversized_range_is_refused_before_allocating():
+    # A million years of one-minute steps would need terabytes if allocated
+    with pytest.raises(ValueError, match="exceeds 100000 points"):
+        transit_julian_days(0.0, 365.25e6, 1 / 1440, 100000)
+    assert len(transit_julian_days(0.0, 99999.0, 1.0, 100000)) == 100000
+
+
+def test_format_ist():
+    assert format_ist([2451545.0]) == ['2000-01-01 17:30']
+    assert format_ist([]) == []
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from vargas import calculate_vargas
+
+ZODIAC = [
+    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
+]
+
+
+# The per-chart rules /generate_kundli used before the lookup tables, one longitude at a time
+
+def calculate_d2(total_degrees, planet):
+    degree_in_rashi = total_degrees % 30
+    if planet in ['Sun', 'Jupiter']:
+        return 'Leo' if degree_in_rashi < 15 else 'Cancer'
+    return 'Cancer' if degree_in_rashi < 15 else 'Leo'
+
+
+def calculate_d4(total_degrees):
+    base_rashi = int(total_degrees / 30)
+    quarter = int(total_degrees % 30 / 7.5)
+    return ZODIAC[(base_rashi + quarter * 3) % 12]
+
+
+def calculate_d9(total_degrees, is_ascendant=False):
+    base_rashi = int(total_degrees / 30)
+    navamsa = int(total_degrees % 30 / 3.333333)
+    start_rashi = base_rashi if base_rashi % 2 == 0 else (base_rashi + 8) % 12
+    initial_rashi_num = (start_rashi + navamsa) % 12
+    return ZODIAC[initial_rashi_num if is_ascendant else (initial_rashi_num + 4) % 12]
+
+
+def calculate_d10(total_degrees):
+    base_rashi = int(total_degrees / 30)
+    division = int(total_degrees % 30 / 3)
+    start_rashi = base_rashi if base_rashi % 2 == 0 else (base_rashi + 8) % 12
+    return ZODIAC[(start_rashi + division) % 12]
+
+
+def calculate_d60(total_degrees):
+    base_rashi = int(total_degrees / 30)
+    division = int(total_degrees % 30 / 0.5)
+    rashi_type = base_rashi % 3
+    if rashi_type == 0:
+        start_rashi = base_rashi
+    elif rashi_type == 1:
+        start_rashi = (base_rashi + 4) % 12
+    else:
+        start_rashi = (base_rashi + 8) % 12
+    return ZODIAC[(start_rashi + division // 5 + division % 5) % 12]
+
+
+def legacy_vargas(longitude, body):
+    charts = {
+        'D2': calculate_d2(longitude, body),
+        'D4': calculate_d4(longitude),
+        'D9': calculate_d9(longitude, is_ascendant=body == 'Ascendant'),
+        'D10': calculate_d10(longitude),
+        'D60': calculate_d60(longitude)
+    }
+    return {varga: ZODIAC.index(sign) + 1 for varga, sign in charts.items()}
+
+
+def pada_edges():
+    # Both the 3.333333 the D9 rule divides by and the exact 10/3, nudged either way
+    edges = np.concatenate([np.arange(10) * 3.333333, np.arange(10) * 10 / 3])
+    edges = (30 * np.arange(12)[:, None] + edges).ravel()
+    edges = np.concatenate([edges + nudge for nudge in (-1e-6, -1e-9, 0, 1e-9, 1e-6)])
+    return edges[(edges >= 0) & (edges < 360)]
+
+
+LONGITUDES = {
+    'random': np.random.default_rng(0).uniform(0, 360, 20000),
+    'arc-minutes': np.arange(360 * 60) / 60,
+    'hundredths': np.arange(36000) * 0.01,
+    'pada edges': pada_edges()
+}
+
+
+@pytest.mark.parametrize('body', ['Sun', 'Moon', 'Ascendant'])
+@pytest.mark.parametrize('name', list(LONGITUDES))
+def test_tables_match_the_legacy_rules(name, body):
+    longitudes = LONGITUDES[name]
+    charts = calculate_vargas(longitudes, [body] * len(longitudes), np.full(len(longitudes), body == 'Ascendant'))
+    for i, longitude in enumerate(longitudes.tolist()):
+        expected = legacy_vargas(longitude, body)
+        actual = {varga: int(signs[i]) for varga, signs in charts.items()}
+        assert actual == expected, f"{body} at {longitude!r}"
@@ -0,0 +1,99 @@
+"""
+Transit (gochar) series: sidereal positions of a set of bodies over a range of times.
+
+Results are columnar, one array per field, and each body is computed for the
+whole range in a single backend call instead of one chart per timestamp.
+Times are read and written in IST, like birth times.
+"""
+import re
+from datetime import datetime
+
+import numpy as np
+import pytz
+import swisseph as swe
+
+from ephemeris import get_backend
+from zodiac import BODIES, NAKSHATRA_SPAN, RASHI_ORDER, nakshatras
+
+IST = pytz.timezone('Asia/Kolkata')
+UNIX_EPOCH_JD = 2440587.5
+
+STEP_UNITS = {'d': 1, 'h': 1 / 24, 'm': 1 / 1440}
+
+RASHI_NAMES = np.array(RASHI_ORDER)
+NAKSHATRA_NAMES = np.array([name for name, _, _ in nakshatras])
+
+
+def parse_ist(value):
+    """
+    Julian day (UT) of an IST "YYYY-MM-DD" or "YYYY-MM-DD HH:MM" string
+    """
+    value = str(value).strip()
+    dt = datetime.strptime(value, "%Y-%m-%d %H:%M" if ' ' in value else "%Y-%m-%d")
+    utc_time = IST.localize(dt).astimezone(pytz.UTC)
+    return swe.julday(utc_time.year, utc_time.month, utc_time.day,
+                      utc_time.hour + utc_time.minute / 60.0)
+
+
+def format_ist(julian_days):
+    """
+    IST "YYYY-MM-DD HH:MM" strings for an array of Julian days (UT)
+    """
+    seconds = np.round((np.asarray(julian_days) - UNIX_EPOCH_JD) * 86400 + 5.5 * 3600)
+    if not seconds.size:
+        # np.char.replace cannot size its output for an empty array
+        return []
+    text = np.datetime_as_string(seconds.astype('datetime64[s]'), unit='m')
+    return np.char.replace(text, 'T', ' ').tolist()
+
+
+def parse_step(value):
+    """
+    Step in days from "1d", "6h" or "30m"
+    """
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([dhm])', str(value).strip().lower())
+    if not match or float(match.group(1)) <= 0:
+        raise ValueError(f"Invalid step: {value} (expected e.g. 1d, 6h, 30m)")
+    return float(match.group(1)) * STEP_UNITS[match.group(2)]
+
+
+def transit_julian_days(start, end, step, max_points):
+    """
+    start, start + step, ... up to and including end, refusing more than max_points
+    """
+    if end < start:
+        raise ValueError("Transit range ends before it starts")
+    count = int(np.floor((end - start) / step + 1e-9)) + 1
+    if count > max_points:
+        raise ValueError(f"Transit range exceeds {max_points} points")
+    return start + step * np.arange(count)
+
+
+def compute_transits(julian_days, bodies, ephemeris=None):
+    """
+    Columnar positions of `bodies` at every Julian day in the array
+    """
+    backend = get_backend(ephemeris)
+    julian_days = np.asarray(julian_days, dtype=np.float64)
+    series = {}
+    positions = {}
+    for body in bodies:
+        planet_num = BODIES[body]
+        if planet_num not in positions:
+            positions[planet_num] = backend.positions(planet_num, julian_days)
+        longitudes, speeds = positions[planet_num]
+        if body == 'Ketu':
+            longitudes = (longitudes + 180) % 360
+
+        series[body] = {
+            'longitude': longitudes.tolist(),
+            'speed': speeds.tolist(),
+            'rashi': RASHI_NAMES[(longitudes / 30).astype(np.int64) % 12].tolist(),
+            'nakshatra': NAKSHATRA_NAMES[(longitudes / NAKSHATRA_SPAN).astype(np.int64) % 27].tolist()
+        }
+
+    return {
+        'time': format_ist(julian_days),
+        'julian_day': julian_days.tolist(),
+        'bodies': series
+    }
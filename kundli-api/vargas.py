@@ -0,0 +1,248 @@
+import os
+
+import numpy as np
+
+from tables import TABLE_DIR, load_tables
+
+# Bodies whose D2 (hora) starts in Leo instead of Cancer
+SOLAR_HORA_BODIES = ('Sun', 'Jupiter')
+
+# The sixteen Parashari divisional charts
+SHODASHAVARGA = (
+    'D1', 'D2', 'D3', 'D4', 'D7', 'D9', 'D10', 'D12',
+    'D16', 'D20', 'D24', 'D27', 'D30', 'D40', 'D45', 'D60'
+)
+
+# Charts returned by /generate_kundli when the request does not ask for others
+DEFAULT_VARGAS = ('D2', 'D4', 'D9', 'D10', 'D60')
+
+ARC_MINUTES = 360 * 60
+
+# Trimsamsa segments (end degree, sign) for odd and even signs
+D30_ODD_EDGES, D30_ODD_SIGNS = np.array([5, 10, 18, 25]), np.array([0, 10, 8, 2, 6])
+D30_EVEN_EDGES, D30_EVEN_SIGNS = np.array([5, 12, 20, 25]), np.array([1, 5, 11, 9, 7])
+
+
+def _split_longitudes(longitudes):
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    base_rashi = (longitudes / 30).astype(np.int64)
+    degree_in_rashi = longitudes % 30
+    return base_rashi, degree_in_rashi
+
+
+def _part(degree_in_rashi, divisions):
+    part = (degree_in_rashi * divisions / 30).astype(np.int64)
+    return np.minimum(part, divisions - 1)
+
+
+def _by_modality(base_rashi, movable, fixed, dual):
+    return np.choose(base_rashi % 3, [movable, fixed, dual])
+
+
+def varga_d1(base_rashi, degree_in_rashi):
+    return base_rashi % 12
+
+
+def varga_d2(base_rashi, degree_in_rashi, solar):
+    first_half = degree_in_rashi < 15
+    # Leo = 4, Cancer = 3 (0-based)
+    return np.where(first_half == solar, 4, 3)
+
+
+def varga_d3(base_rashi, degree_in_rashi):
+    return (base_rashi + 4 * _part(degree_in_rashi, 3)) % 12
+
+
+def varga_d4(base_rashi, degree_in_rashi):
+    quarter = (degree_in_rashi / 7.5).astype(np.int64)
+    return (base_rashi + quarter * 3) % 12
+
+
+def varga_d7(base_rashi, degree_in_rashi):
+    start_rashi = np.where(base_rashi % 2 == 0, base_rashi, base_rashi + 6)
+    return (start_rashi + _part(degree_in_rashi, 7)) % 12
+
+
+def varga_d9(base_rashi, degree_in_rashi, is_ascendant):
+    navamsa = (degree_in_rashi / 3.333333).astype(np.int64)
+    start_rashi = np.where(base_rashi % 2 == 0, base_rashi, (base_rashi + 8) % 12)
+    initial_rashi_num = (start_rashi + navamsa) % 12
+    return np.where(is_ascendant, initial_rashi_num, (initial_rashi_num + 4) % 12)
+
+
+def varga_d10(base_rashi, degree_in_rashi):
+    division = (degree_in_rashi / 3).astype(np.int64)
+    start_rashi = np.where(base_rashi % 2 == 0, base_rashi, (base_rashi + 8) % 12)
+    return (start_rashi + division) % 12
+
+
+def varga_d12(base_rashi, degree_in_rashi):
+    return (base_rashi + _part(degree_in_rashi, 12)) % 12
+
+
+def varga_d16(base_rashi, degree_in_rashi):
+    start_rashi = _by_modality(base_rashi, 0, 4, 8)
+    return (start_rashi + _part(degree_in_rashi, 16)) % 12
+
+
+def varga_d20(base_rashi, degree_in_rashi):
+    start_rashi = _by_modality(base_rashi, 0, 8, 4)
+    return (start_rashi + _part(degree_in_rashi, 20)) % 12
+
+
+def varga_d24(base_rashi, degree_in_rashi):
+    start_rashi = np.where(base_rashi % 2 == 0, 4, 3)
+    return (start_rashi + _part(degree_in_rashi, 24)) % 12
+
+
+def varga_d27(base_rashi, degree_in_rashi):
+    # Fire, earth, air and water signs start from Aries, Cancer, Libra, Capricorn
+    start_rashi = np.choose(base_rashi % 4, [0, 3, 6, 9])
+    return (start_rashi + _part(degree_in_rashi, 27)) % 12
+
+
+def varga_d30(base_rashi, degree_in_rashi):
+    odd = D30_ODD_SIGNS[np.searchsorted(D30_ODD_EDGES, degree_in_rashi, side='right')]
+    even = D30_EVEN_SIGNS[np.searchsorted(D30_EVEN_EDGES, degree_in_rashi, side='right')]
+    return np.where(base_rashi % 2 == 0, odd, even)
+
+
+def varga_d40(base_rashi, degree_in_rashi):
+    start_rashi = np.where(base_rashi % 2 == 0, 0, 6)
+    return (start_rashi + _part(degree_in_rashi, 40)) % 12
+
+
+def varga_d45(base_rashi, degree_in_rashi):
+    start_rashi = _by_modality(base_rashi, 0, 4, 8)
+    return (start_rashi + _part(degree_in_rashi, 45)) % 12
+
+
+def varga_d60(base_rashi, degree_in_rashi):
+    division = (degree_in_rashi / 0.5).astype(np.int64)
+    rashi_type = base_rashi % 3
+    start_rashi = (base_rashi + 4 * rashi_type) % 12
+    return (start_rashi + division // 5 + division % 5) % 12
+
+
+# Charts that depend only on the longitude. D2 and D9 also take the body/ascendant flag.
+VARGA_FUNCTIONS = {
+    'D1': varga_d1, 'D3': varga_d3, 'D4': varga_d4, 'D7': varga_d7,
+    'D10': varga_d10, 'D12': varga_d12, 'D16': varga_d16, 'D20': varga_d20,
+    'D24': varga_d24, 'D27': varga_d27, 'D30': varga_d30, 'D40': varga_d40,
+    'D45': varga_d45, 'D60': varga_d60
+}
+
+
+def _body_flags(shape, bodies, is_ascendant):
+    if bodies is None:
+        solar = np.zeros(shape, dtype=bool)
+    else:
+        solar = np.isin(np.asarray(bodies), SOLAR_HORA_BODIES)
+    if is_ascendant is None:
+        is_ascendant = np.zeros(shape, dtype=bool)
+    else:
+        is_ascendant = np.asarray(is_ascendant, dtype=bool)
+    return solar, is_ascendant
+
+
+def _compute_varga(varga, base_rashi, degree_in_rashi, solar, is_ascendant):
+    if varga == 'D2':
+        return varga_d2(base_rashi, degree_in_rashi, solar)
+    if varga == 'D9':
+        return varga_d9(base_rashi, degree_in_rashi, is_ascendant)
+    if varga not in VARGA_FUNCTIONS:
+        raise ValueError(f"Unsupported divisional chart: {varga}")
+    return VARGA_FUNCTIONS[varga](base_rashi, degree_in_rashi)
+
+
+def compute_vargas(longitudes, bodies=None, is_ascendant=None, vargas=DEFAULT_VARGAS):
+    """
+    Evaluate the divisional chart rules directly for an array of sidereal longitudes.
+
+    This is the reference the lookup tables are built from; prefer `calculate_vargas`.
+    """
+    base_rashi, degree_in_rashi = _split_longitudes(longitudes)
+    solar, is_ascendant = _body_flags(base_rashi.shape, bodies, is_ascendant)
+    return {
+        varga: _compute_varga(varga, base_rashi, degree_in_rashi, solar, is_ascendant) + 1
+        for varga in vargas
+    }
+
+
+def build_varga_tables():
+    """
+    Precompute every varga over the 21,600 arc-minutes of the zodiac.
+
+    Returns (table, boundary): table[v, m] is the 0-based sign at the start of
+    arc-minute m (D2 for a non-solar body, D9 for an ascendant), and boundary[v, m]
+    marks minutes that a division boundary falls in or next to. Lookups in those
+    minutes are recomputed exactly, everything else is a single index.
+    """
+    minutes = np.arange(ARC_MINUTES)
+    # One micro-degree either side covers float error in the minute index
+    samples = [minutes / 60, minutes / 60 - 1e-6, (minutes + 1) / 60 + 1e-6]
+    samples[1][0] = 0.0
+    split = [_split_longitudes(sample) for sample in samples]
+    flags = (np.zeros(ARC_MINUTES, dtype=bool), np.ones(ARC_MINUTES, dtype=bool))
+
+    table = np.empty((len(SHODASHAVARGA), ARC_MINUTES), dtype=np.int8)
+    boundary = np.zeros((len(SHODASHAVARGA), ARC_MINUTES), dtype=bool)
+    for i, varga in enumerate(SHODASHAVARGA):
+        start, before, after = (_compute_varga(varga, *parts, *flags) for parts in split)
+        table[i] = start
+        boundary[i] = (start != before) | (start != after)
+    # The last minute wraps into Aries
+    boundary[:, -1] = True
+    return table, boundary
+
+
+def load_varga_tables():
+    """
+    Memory-map the tables from KUNDLI_TABLE_DIR/vargas when built there, else build them
+    """
+    directory = os.path.join(TABLE_DIR, 'vargas') if TABLE_DIR else None
+    if directory and os.path.isdir(directory):
+        tables = load_tables(directory)
+        return tables['table'], tables['boundary']
+    return build_varga_tables()
+
+
+VARGA_INDEX = {varga: i for i, varga in enumerate(SHODASHAVARGA)}
+VARGA_TABLE, VARGA_BOUNDARY = load_varga_tables()
+
+
+def calculate_vargas(longitudes, bodies=None, is_ascendant=None, vargas=DEFAULT_VARGAS):
+    """
+    Divisional charts for an array of sidereal longitudes, served from the arc-minute tables.
+
+    `bodies` holds the body name for each longitude (used by the D2 Sun/Jupiter
+    rule) and `is_ascendant` flags the entries that are lagnas (used by D9).
+    Returns a dict of varga name -> int array of sign numbers (Aries = 1).
+    """
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    minute = np.minimum((longitudes % 360 * 60).astype(np.int64), ARC_MINUTES - 1)
+    solar, is_ascendant = _body_flags(longitudes.shape, bodies, is_ascendant)
+
+    charts = {}
+    for varga in vargas:
+        if varga not in VARGA_INDEX:
+            raise ValueError(f"Unsupported divisional chart: {varga}")
+        row = VARGA_INDEX[varga]
+        signs = VARGA_TABLE[row][minute].astype(np.int64)
+
+        exact = VARGA_BOUNDARY[row][minute]
+        if exact.any():
+            base_rashi, degree_in_rashi = _split_longitudes(longitudes[exact])
+            signs[exact] = _compute_varga(
+                varga, base_rashi, degree_in_rashi,
+                np.zeros(base_rashi.shape, dtype=bool), np.ones(base_rashi.shape, dtype=bool)
+            )
+
+        if varga == 'D2':
+            signs = np.where(solar, 7 - signs, signs)
+        elif varga == 'D9':
+            signs = np.where(is_ascendant, signs, (signs + 4) % 12)
+        charts[varga] = signs + 1
+
+    return charts
+
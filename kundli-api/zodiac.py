@@ -0,0 +1,84 @@
+"""
+Zodiac reference data shared by the chart, transit and calendar code
+"""
+import swisseph as swe
+
+# Mapping of Sanskrit Rashis to English names
+RASHI_TRANSLATION = {
+    'Mesha': 'Aries',
+    'Vrishabha': 'Taurus',
+    'Mithuna': 'Gemini',
+    'Karka': 'Cancer',
+    'Simha': 'Leo',
+    'Kanya': 'Virgo',
+    'Tula': 'Libra',
+    'Vrishchika': 'Scorpio',
+    'Dhanu': 'Sagittarius',
+    'Makara': 'Capricorn',
+    'Kumbha': 'Aquarius',
+    'Meena': 'Pisces'
+}
+
+# English rashi names in zodiac order
+RASHI_ORDER = list(RASHI_TRANSLATION.values())
+
+# Mapping of Rashis and their lords (using English names)
+rashis = {
+    'Aries': {'lord': 'Mars'},
+    'Taurus': {'lord': 'Venus'},
+    'Gemini': {'lord': 'Mercury'},
+    'Cancer': {'lord': 'Moon'},
+    'Leo': {'lord': 'Sun'},
+    'Virgo': {'lord': 'Mercury'},
+    'Libra': {'lord': 'Venus'},
+    'Scorpio': {'lord': 'Mars'},
+    'Sagittarius': {'lord': 'Jupiter'},
+    'Capricorn': {'lord': 'Saturn'},
+    'Aquarius': {'lord': 'Saturn'},
+    'Pisces': {'lord': 'Jupiter'}
+}
+
+# Nakshatras and their Lords
+nakshatras = [
+    ('Ashwini', 'Ketu', 0), ('Bharani', 'Venus', 13.20), ('Krittika', 'Sun', 26.40), 
+    ('Rohini', 'Moon', 40), ('Mrigashira', 'Mars', 53.20), ('Ardra', 'Rahu', 66.40), 
+    ('Punarvasu', 'Jupiter', 80), ('Pushya', 'Saturn', 93.20), ('Ashlesha', 'Mercury', 106.40),
+    ('Magha', 'Ketu', 120), ('Purva Phalguni', 'Venus', 133.20), ('Uttara Phalguni', 'Sun', 146.40),
+    ('Hasta', 'Moon', 160), ('Chitra', 'Mars', 173.20), ('Swati', 'Rahu', 186.40),
+    ('Vishakha', 'Jupiter', 200), ('Anuradha', 'Saturn', 213.20), ('Jyeshtha', 'Mercury', 226.40),
+    ('Mula', 'Ketu', 240), ('Purva Ashadha', 'Venus', 253.20), ('Uttara Ashadha', 'Sun', 266.40),
+    ('Shravana', 'Moon', 280), ('Dhanishta', 'Mars', 293.20), ('Shatabhisha', 'Rahu', 306.40),
+    ('Purva Bhadrapada', 'Jupiter', 320), ('Uttara Bhadrapada', 'Saturn', 333.20), ('Revati', 'Mercury', 346.40)
+]
+
+NAKSHATRA_SPAN = 360 / 27
+
+# Bodies by name, in the order charts list them. Ketu has no swisseph id of its
+# own: it is always the point opposite Rahu (the mean node).
+BODIES = {
+    'Sun': swe.SUN, 'Moon': swe.MOON, 'Mars': swe.MARS,
+    'Mercury': swe.MERCURY, 'Venus': swe.VENUS,
+    'Jupiter': swe.JUPITER, 'Saturn': swe.SATURN,
+    'Neptune': swe.NEPTUNE, 'Uranus': swe.URANUS, 'Pluto': swe.PLUTO,
+    'Rahu': swe.MEAN_NODE, 'Ketu': swe.MEAN_NODE
+}
+
+# Natural (naisargika) friends and enemies of the seven grahas; the rest are neutral
+NATURAL_FRIENDS = {
+    'Sun': ('Moon', 'Mars', 'Jupiter'),
+    'Moon': ('Sun', 'Mercury'),
+    'Mars': ('Sun', 'Moon', 'Jupiter'),
+    'Mercury': ('Sun', 'Venus'),
+    'Jupiter': ('Sun', 'Moon', 'Mars'),
+    'Venus': ('Mercury', 'Saturn'),
+    'Saturn': ('Mercury', 'Venus')
+}
+NATURAL_ENEMIES = {
+    'Sun': ('Venus', 'Saturn'),
+    'Moon': (),
+    'Mars': ('Mercury',),
+    'Mercury': ('Moon',),
+    'Jupiter': ('Mercury', 'Venus'),
+    'Venus': ('Sun', 'Moon'),
+    'Saturn': ('Sun', 'Moon', 'Mars')
+}